@@ -1,26 +1,66 @@
 import subprocess
 import os
 
+import numpy as np
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 INPUT_VIDEO = os.path.join(BASE_DIR, "../input_video/raw.mp4")
 OUTPUT_AUDIO = os.path.join(BASE_DIR, "audio.wav")
 
-def extract_audio():
-    if not os.path.exists(INPUT_VIDEO):
-        raise FileNotFoundError(f"Input video not found at {INPUT_VIDEO}")
+SAMPLE_RATE = 16000
+STREAM_BLOCK_SECONDS = 5
+
+def extract_audio(input_video=INPUT_VIDEO, output_audio=OUTPUT_AUDIO):
+    if not os.path.exists(input_video):
+        raise FileNotFoundError(f"Input video not found at {input_video}")
 
     command = [
         "ffmpeg",
         "-y",
-        "-i", INPUT_VIDEO,
+        "-i", input_video,
         "-ac", "1",
         "-ar", "16000",
-        OUTPUT_AUDIO
+        output_audio
     ]
 
     subprocess.run(command, check=True)
     print("✅ Audio extracted successfully")
+    return output_audio
+
+def stream_audio(input_video=INPUT_VIDEO, block_seconds=STREAM_BLOCK_SECONDS):
+    """
+    Decode the video's audio with ffmpeg and yield 16 kHz mono float32
+    blocks straight from its stdout, without writing a WAV file.
+    """
+    if not os.path.exists(input_video):
+        raise FileNotFoundError(f"Input video not found at {input_video}")
+
+    command = [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel", "error",
+        "-i", input_video,
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "-"
+    ]
+
+    block_bytes = int(block_seconds * SAMPLE_RATE) * 2
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE)
+
+    try:
+        while True:
+            raw = proc.stdout.read(block_bytes)
+            if not raw:
+                break
+            # same scaling as whisper.load_audio
+            yield np.frombuffer(raw[:len(raw) // 2 * 2], np.int16).astype(np.float32) / 32768.0
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command)
 
 if __name__ == "__main__":
     extract_audio()
@@ -0,0 +1,112 @@
+import os
+import sys
+import wave
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIO_PATH = os.path.join(BASE_DIR, "audio.wav")
+
+SAMPLE_RATE = 16000
+
+FRAME_SECONDS = 0.03
+NOISE_PERCENTILE = 10     # quietest frames estimate the noise floor
+SPEECH_MARGIN_DB = 12     # speech must be this much louder than the floor
+MIN_SPEECH_DB = -50       # absolute floor, so near-silent files stay silent
+MIN_SILENCE_SECONDS = 0.6 # shorter gaps are bridged (breaths, word gaps)
+MIN_SPEECH_SECONDS = 0.2  # shorter bursts are treated as clicks
+PADDING_SECONDS = 0.25    # keep some context around every region
+
+# -----------------------------
+# DETECTION
+# -----------------------------
+
+def frame_db(audio):
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    n = len(audio) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n * frame].reshape(n, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+def _runs(mask):
+    """
+    (start, end) frame indices of every run of True in a boolean array.
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def detect_speech_regions(audio):
+    """
+    Energy-based VAD over a 16 kHz float32 signal.
+    Returns [(start_seconds, end_seconds)] of speech, padded and merged.
+    """
+    db = frame_db(audio)
+    if len(db) == 0:
+        return []
+
+    duration = len(audio) / SAMPLE_RATE
+    floor, peak = np.percentile(db, [NOISE_PERCENTILE, 100 - NOISE_PERCENTILE])
+
+    # no quiet frames to estimate a floor from (steady speech, music bed):
+    # treat the whole signal as speech unless it is silent throughout
+    if peak - floor < SPEECH_MARGIN_DB:
+        return [(0.0, duration)] if peak > MIN_SPEECH_DB else []
+
+    threshold = max(floor + SPEECH_MARGIN_DB, MIN_SPEECH_DB)
+    speech = db > threshold
+
+    # bridge short pauses
+    starts, ends = _runs(~speech)
+    for s, e in zip(starts, ends):
+        if s > 0 and e < len(speech) and (e - s) * FRAME_SECONDS < MIN_SILENCE_SECONDS:
+            speech[s:e] = True
+
+    # drop clicks
+    starts, ends = _runs(speech)
+    keep = (ends - starts) * FRAME_SECONDS >= MIN_SPEECH_SECONDS
+
+    regions = []
+    for s, e in zip(starts[keep], ends[keep]):
+        start = max(0.0, s * FRAME_SECONDS - PADDING_SECONDS)
+        end = min(duration, e * FRAME_SECONDS + PADDING_SECONDS)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+
+    return regions
+
+def vad_report(audio, regions):
+    total = len(audio) / SAMPLE_RATE
+    speech = sum(e - s for s, e in regions)
+    skipped = total - speech
+    return {
+        "total_seconds": round(total, 2),
+        "speech_seconds": round(speech, 2),
+        "skipped_seconds": round(skipped, 2),
+        "skipped_ratio": round(skipped / total, 3) if total else 0.0,
+        "regions": len(regions),
+    }
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+def load_wav(path):
+    with wave.open(path, "rb") as f:
+        if f.getframerate() != SAMPLE_RATE or f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise ValueError(f"Expected 16 kHz mono 16-bit audio: {path}")
+        raw = f.readframes(f.getnframes())
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else AUDIO_PATH
+    audio = load_wav(path)
+    regions = detect_speech_regions(audio)
+    report = vad_report(audio, regions)
+
+    print(f"✅ {report['regions']} speech regions — "
+          f"{report['skipped_seconds']}s of {report['total_seconds']}s skipped "
+          f"({report['skipped_ratio']:.0%})")
@@ -19,13 +19,7 @@ def clear_old_translations():
             print(f"🧹 Removed stale translated captions: {fname}")
 
 
-def main():
-    # 🔑 CRITICAL FIX: clear old translated captions
-    clear_old_translations()
-
-    with open(SEGMENTS_PATH, "r", encoding="utf-8") as f:
-        segments = json.load(f)
-
+def build_captions(segments):
     captions = []
     for seg in segments:
         captions.append({
@@ -33,6 +27,17 @@ def main():
             "end": seg["end"],
             "words": seg["words"]
         })
+    return captions
+
+
+def main():
+    # 🔑 CRITICAL FIX: clear old translated captions
+    clear_old_translations()
+
+    with open(SEGMENTS_PATH, "r", encoding="utf-8") as f:
+        segments = json.load(f)
+
+    captions = build_captions(segments)
 
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
         json.dump(captions, f, indent=2, ensure_ascii=False)
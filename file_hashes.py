@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+
+# -----------------------------
+# PATHS
+# -----------------------------
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+HASH_INDEX_PATH = os.path.join(PROJECT_ROOT, ".cache", "pipeline", "file_hashes.json")
+
+# -----------------------------
+# INDEX
+# -----------------------------
+# sha256 per absolute path, with the (size, mtime) it was computed at.
+# Shared by the pipeline's stage keys and the renderer's proxy and chunk
+# keys, so a large video is only read once per change.
+
+def load_hash_index(path=HASH_INDEX_PATH):
+    """
+    The on-disk index; a missing or unreadable one is empty.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+def save_hash_index(index, path=HASH_INDEX_PATH):
+    """
+    Merge `index` into the on-disk index and replace it atomically, so
+    entries another writer added since our load are kept and a reader
+    never sees a half-written file.
+    """
+    merged = dict(load_hash_index(path), **index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2)
+    os.replace(path + ".part", path)
+
+def hash_file(path, index):
+    """
+    sha256 of a file, memoized on (size, mtime) so large videos
+    are only read again after they actually change.
+    """
+    if not os.path.exists(path):
+        return None
+
+    st = os.stat(path)
+    entry = index.get(path)
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+
+    digest = h.hexdigest()
+    index[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    return digest
+
+def content_hash(path, index_path=HASH_INDEX_PATH):
+    """
+    hash_file through the on-disk index, for callers outside a pipeline
+    run (proxies, render chunks). The index is only written when the
+    file had to be hashed.
+    """
+    path = os.path.abspath(path)
+    index = load_hash_index(index_path)
+    before = index.get(path)
+    digest = hash_file(path, index)
+    if digest is not None and index[path] != before:
+        save_hash_index({path: index[path]}, index_path)
+    return digest
@@ -10,6 +10,11 @@ from pathlib import Path
 # -----------------------------
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from renderer.proxy import ensure_proxy
+from transcription.whisper_server import ensure_server
 
 INPUT_VIDEO_PATH = os.path.join(
     PROJECT_ROOT, "input_video", "raw.mp4"
@@ -60,9 +65,10 @@ def run_command_parser(command: str):
     except Exception:
         pass
 
-def run_pipeline():
+def run_pipeline(profile="draft"):
+    # Previews use the fast draft profile; "final" is for the export
     subprocess.run(
-        [sys.executable, "run_pipeline.py"],
+        [sys.executable, "run_pipeline.py", "--profile", profile],
         cwd=PROJECT_ROOT
     )
 
@@ -71,6 +77,11 @@ def save_uploaded_video(uploaded_file):
     with open(INPUT_VIDEO_PATH, "wb") as f:
         f.write(uploaded_file.read())
 
+@st.cache_resource
+def start_transcription_server():
+    # One warm Whisper model for every render triggered from this app
+    return ensure_server()
+
 # -----------------------------
 # STREAMLIT CONFIG
 # -----------------------------
@@ -80,6 +91,8 @@ st.set_page_config(
     layout="wide"
 )
 
+start_transcription_server()
+
 # -----------------------------
 # CUSTOM CSS (SAFE, INLINE)
 # -----------------------------
@@ -126,7 +139,14 @@ uploaded_video = st.file_uploader(
 )
 
 if uploaded_video:
-    save_uploaded_video(uploaded_video)
+    # Streamlit reruns this script on every click; only a new upload is
+    # written to disk and proxied
+    upload_id = getattr(uploaded_video, "file_id", None) or f"{uploaded_video.name}:{uploaded_video.size}"
+    if st.session_state.get("upload_id") != upload_id:
+        save_uploaded_video(uploaded_video)
+        # Previews decode this low-res proxy; the upload is kept for export
+        ensure_proxy(INPUT_VIDEO_PATH)
+        st.session_state["upload_id"] = upload_id
     st.success("Video uploaded successfully. You can now run commands and render.")
 
 st.markdown('</div>', unsafe_allow_html=True)
@@ -143,7 +163,7 @@ command = st.text_input(
     placeholder="e.g. Make captions bigger and move visuals to the left"
 )
 
-col1, col2 = st.columns(2)
+col1, col2, col3 = st.columns(3)
 
 with col1:
     if st.button("Apply Command", use_container_width=True):
@@ -152,9 +172,14 @@ with col1:
             st.success("Command understood and applied.")
 
 with col2:
-    if st.button("Render Video", use_container_width=True):
-        run_pipeline()
-        st.success("Video rendered successfully.")
+    if st.button("Render Preview", use_container_width=True):
+        run_pipeline("draft")
+        st.success("Preview rendered successfully.")
+
+with col3:
+    if st.button("Export Final", use_container_width=True):
+        run_pipeline("final")
+        st.success("Full-quality video exported.")
 
 st.markdown('<div class="hint">Try commands like: “remove background boxes”, “use slide animations”, “disable b-roll”.</div>', unsafe_allow_html=True)
 st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,125 @@
+import os
+import re
+import subprocess
+from functools import lru_cache
+
+from renderer.profiles import output_size, probe, x264_args
+
+# ==================== CONFIG ====================
+
+KEYFRAME_TOLERANCE = 0.1   # a 16:9 cut may start this much early to land on a keyframe
+
+# ==================== KEYFRAMES ====================
+
+@lru_cache(maxsize=32)
+def _keyframes(path, size, mtime_ns):
+    # -skip_frame nokey decodes keyframes only, so this is cheap
+    command = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-skip_frame", "nokey",
+        "-i", path,
+        "-an", "-vf", "showinfo",
+        "-f", "null", "-"
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return tuple(float(t) for t in re.findall(r"pts_time:\s*([0-9.]+)", result.stderr))
+
+def keyframe_times(path):
+    st = os.stat(path)
+    return _keyframes(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+def copy_start(keyframes, start, tolerance=KEYFRAME_TOLERANCE):
+    """
+    Keyframe a stream copy of a clip starting at `start` can begin on,
+    or None if the nearest one before it is further than `tolerance`.
+    """
+    candidates = [k for k in keyframes if k <= start + 1e-3]
+    if candidates and start - candidates[-1] <= tolerance:
+        return candidates[-1]
+    return None
+
+def copy_point(source, start, profile):
+    """
+    Where a 16:9 stream copy of a clip starting at `start` would begin,
+    or None when it has to be re-encoded (no keyframe close enough, or
+    the profile needs a smaller frame than the source).
+    """
+    w, h, _, _ = probe(source)
+    if output_size(w, h, profile) != (w, h):
+        return None
+    return copy_start(keyframe_times(source), start)
+
+# ==================== EXPORT ====================
+
+def crop_9x16(w, h):
+    """
+    (x, width) of the centred 9:16 window, width kept even for yuv420p.
+    """
+    target_w = int(h * 9 / 16)
+    x_center = w // 2
+    x1 = max(0, x_center - target_w // 2)
+    x2 = min(w, x_center + target_w // 2)
+    return x1, (x2 - x1) // 2 * 2
+
+def stream_copy(source, start, end, out_path):
+    """
+    Cut [start, end) without re-encoding; start must be a keyframe.
+    Seeking a millisecond past it lands on that keyframe (not the one
+    before), and the timestamps are shifted so it is the first frame.
+    """
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-ss", f"{start + 0.001:.3f}",
+        "-t", f"{end - start:.3f}",
+        "-i", source,
+        "-map", "0:v", "-map", "0:a?",
+        "-c", "copy",
+        "-avoid_negative_ts", "make_zero",
+        out_path
+    ]
+    subprocess.run(command, check=True)
+    return out_path
+
+def encode_crops(source, start, end, outputs, profile):
+    """
+    Decode [start, end) once and encode every requested aspect from the
+    same frames: `outputs` maps "16x9" / "9x16" to paths. One ffmpeg
+    process splits the decoded stream and runs an encoder per output.
+    """
+    w, h, fps, _ = probe(source)
+    out_w, out_h = output_size(w, h, profile)
+    fps = min(fps, profile["fps"]) if profile["fps"] else fps
+
+    chains = {}
+    if "16x9" in outputs:
+        chains["16x9"] = f"scale={out_w}:{out_h}" if (out_w, out_h) != (w, h) else "null"
+    if "9x16" in outputs:
+        x, crop_w = crop_9x16(w, h)
+        chain = f"crop={crop_w}:{h}:{x}:0"
+        if (out_w, out_h) != (w, h):
+            chain += f",scale=-2:{out_h}"
+        chains["9x16"] = chain
+
+    names = list(chains)
+    graph = [f"[0:v]split={len(names)}" + "".join(f"[s{i}]" for i in range(len(names)))]
+    graph += [f"[s{i}]{chains[name]}[v{i}]" for i, name in enumerate(names)]
+
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-ss", f"{start:.3f}",
+        "-t", f"{end - start:.3f}",
+        "-i", source,
+        "-filter_complex", ";".join(graph),
+    ]
+    for i, name in enumerate(names):
+        command += [
+            "-map", f"[v{i}]", "-map", "0:a?",
+            *x264_args(profile),
+            "-r", f"{fps:g}",
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            outputs[name]
+        ]
+
+    subprocess.run(command, check=True)
+    return outputs
@@ -1,16 +1,22 @@
+import argparse
 import os
+import sys
 import json
-from moviepy.editor import VideoFileClip
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from highlights.ffmpeg_export import copy_point, encode_crops, stream_copy
+from highlights.scoring import load_audio, select_highlights
+from renderer.profiles import RENDER_PROFILES, get_profile
 
 STATE_PATH = os.path.join(PROJECT_ROOT, "nlp_command_parser", "editor_state.json")
-DECISIONS_PATH = os.path.join(
-    PROJECT_ROOT,
-    "visual_decision_engine",
-    "visual_decisions.json"
-)
+SEGMENTS_PATH = os.path.join(PROJECT_ROOT, "segmentation", "segments.json")
+AUDIO_PATH = os.path.join(PROJECT_ROOT, "audio_processing", "audio.wav")
 
 BASE_VIDEO = os.path.join(PROJECT_ROOT, "renderer", "base.mp4")
 CAPTIONED_VIDEO = os.path.join(PROJECT_ROOT, "renderer", "output.mp4")
@@ -18,6 +24,9 @@ CAPTIONED_VIDEO = os.path.join(PROJECT_ROOT, "renderer", "output.mp4")
 OUT_DIR = os.path.join(BASE_DIR, "outputs")
 os.makedirs(OUT_DIR, exist_ok=True)
 
+# Concurrent export jobs (capped at the CPU count)
+WORKERS = int(os.getenv("HIGHLIGHT_WORKERS", str(os.cpu_count() or 1)))
+
 # -------------------------
 # Utilities
 # -------------------------
@@ -25,53 +34,76 @@ def load_json(path):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def rank_segments(decisions, k=3):
-    scored = []
-    for d in decisions:
-        score = 0
-        score += 2 if d.get("emphasis") else 0
-        score += 1 if d.get("overlay") else 0
-        scored.append((score, d))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [d for _, d in scored[:k]]
-
 # -------------------------
 # Export helpers
 # -------------------------
-def export_16x9(video, start, end, out_path):
-    clip = video.subclip(start, end)
-    clip.write_videofile(
-        out_path,
-        codec="libx264",
-        audio_codec="aac",
-        verbose=False,
-        logger=None
-    )
-
-def export_9x16(video, start, end, out_path):
-    clip = video.subclip(start, end)
-    w, h = clip.w, clip.h
-
-    target_w = int(h * 9 / 16)
-    x_center = w // 2
-    x1 = max(0, x_center - target_w // 2)
-    x2 = min(w, x_center + target_w // 2)
-
-    vertical = clip.crop(x1=x1, x2=x2)
-    vertical.write_videofile(
-        out_path,
-        codec="libx264",
-        audio_codec="aac",
-        verbose=False,
-        logger=None
-    )
+def export_16x9(source, start, end, out_path, profile):
+    """
+    Stream copy when the cut can start on a keyframe, otherwise one
+    ffmpeg re-encode of just this range.
+    """
+    keyframe = copy_point(source, start, profile)
+    if keyframe is not None:
+        stream_copy(source, keyframe, end, out_path)
+        return "copy"
+    encode_crops(source, start, end, {"16x9": out_path}, profile)
+    return "encode"
+
+def export_9x16(source, start, end, out_path, profile):
+    encode_crops(source, start, end, {"9x16": out_path}, profile)
+    return "encode"
+
+def export_both(source, start, end, out_16x9, out_9x16, profile):
+    """
+    16:9 and 9:16 of one range. If the 16:9 cut can't be copied, both
+    come from a single decode of the range.
+    """
+    keyframe = copy_point(source, start, profile)
+    if keyframe is not None:
+        stream_copy(source, keyframe, end, out_16x9)
+        encode_crops(source, start, end, {"9x16": out_9x16}, profile)
+        return "copy"
+    encode_crops(source, start, end, {"16x9": out_16x9, "9x16": out_9x16}, profile)
+    return "encode"
+
+def export_job(source, job, profile):
+    """
+    One highlight (and its 9:16 crop) in its own ffmpeg processes.
+    Returns (index, how, seconds).
+    """
+    i, start, end, out_16x9, out_9x16 = job
+    started = time.perf_counter()
+    if out_9x16:
+        how = export_both(source, start, end, out_16x9, out_9x16, profile)
+    else:
+        how = export_16x9(source, start, end, out_16x9, profile)
+    return i, how, time.perf_counter() - started
+
+def export_all(source, jobs, profile, workers=WORKERS):
+    """
+    Run export jobs concurrently, at most one per core; x264 threads are
+    split between them. Results come back in job order.
+    """
+    workers = max(1, min(workers, os.cpu_count() or 1, len(jobs) or 1))
+    profile = dict(profile, threads=max(1, (os.cpu_count() or 1) // workers))
+
+    # the work happens in ffmpeg child processes, so threads only wait on them
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: export_job(source, job, profile), jobs))
 
 # -------------------------
 # Main
 # -------------------------
 def main():
+    parser = argparse.ArgumentParser(description="Export highlight clips")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES), help="render profile (default: editor state)")
+    parser.add_argument("--count", type=int, help="highlights to export (default: editor state, else 3)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="concurrent export jobs")
+    args = parser.parse_args()
+
     state = load_json(STATE_PATH)
     highlights = state.get("highlights", {})
+    profile = get_profile(args.profile or state.get("render", {}).get("profile", "final"))
 
     if not highlights.get("enabled", False):
         print("ℹ️ Highlights disabled. Skipping.")
@@ -86,20 +118,31 @@ def main():
         print("❌ Source video not found:", source_video_path)
         return
 
-    video = VideoFileClip(source_video_path)
-    decisions = load_json(DECISIONS_PATH)
-    picks = rank_segments(decisions)
-
-    for i, seg in enumerate(picks, 1):
-        out_16x9 = os.path.join(OUT_DIR, f"highlight_{i}_16x9.mp4")
-        export_16x9(video, seg["start"], seg["end"], out_16x9)
-        print(f"✅ Exported {out_16x9}")
-
-        if vertical_enabled:
-            out_9x16 = os.path.join(OUT_DIR, f"highlight_{i}_9x16.mp4")
-            export_9x16(video, seg["start"], seg["end"], out_9x16)
-            print(f"✅ Exported {out_9x16}")
+    segments = load_json(SEGMENTS_PATH)
+    count = args.count or highlights.get("count", 3)
+    picks = select_highlights(
+        segments, k=count,
+        target_seconds=highlights.get("target_duration", 60),
+        audio=load_audio(AUDIO_PATH)
+    )
 
+    jobs = [
+        (
+            i, seg["start"], seg["end"],
+            os.path.join(OUT_DIR, f"highlight_{i}_16x9.mp4"),
+            os.path.join(OUT_DIR, f"highlight_{i}_9x16.mp4") if vertical_enabled else None,
+        )
+        for i, seg in enumerate(picks, 1)
+    ]
+
+    started = time.perf_counter()
+    for i, how, seconds in export_all(source_video_path, jobs, profile, args.workers):
+        _, _, _, out_16x9, out_9x16 = jobs[i - 1]
+        print(f"✅ Exported {out_16x9} ({how}, {seconds:.1f}s)")
+        if out_9x16:
+            print(f"✅ Exported {out_9x16} (encode)")
+
+    print(f"⏱️ {len(jobs)} highlights in {time.perf_counter() - started:.1f}s")
     print("✨ Highlight generation complete")
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+import heapq
+import os
+from bisect import bisect_left
+
+import numpy as np
+
+from audio_processing.vad import SAMPLE_RATE, load_wav
+from visual_decision_engine.decision_engine import TOPIC_INDEX
+from visual_decision_engine.topic_index import normalize
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+# Feature weights; every feature is z-scored across segments first
+WEIGHTS = {
+    "emphasis_density": 1.0,   # share of emphasized words
+    "speech_rate": 0.5,        # words per second
+    "pause_ratio": -0.7,       # share of the segment spent in internal pauses
+    "lead_pause": 0.3,         # silence before the segment (a clean entry point)
+    "topic_hits": 0.8,         # share of words that are topic keywords
+    "loudness": 0.6,           # mean RMS level from the WAV, in dB
+}
+
+MIN_HIGHLIGHT_SECONDS = 5      # short segments are extended with their successors
+MAX_LEAD_PAUSE = 1.0           # longer silences count the same
+LOUDNESS_FRAME_SECONDS = 0.05
+
+TOPIC_TOKENS = TOPIC_INDEX["tokens"]
+
+# -----------------------------
+# FEATURES
+# -----------------------------
+
+def segment_loudness(audio, starts, ends):
+    """
+    Mean RMS level (dB) of every [start, end) range, from one prefix sum
+    of per-frame energy: O(frames + segments).
+    """
+    frame = int(SAMPLE_RATE * LOUDNESS_FRAME_SECONDS)
+    n = len(audio) // frame
+    if n == 0:
+        return np.zeros(len(starts))
+
+    frames = audio[:n * frame].reshape(n, frame).astype(np.float64)
+    energy = np.concatenate(([0.0], np.cumsum(np.mean(frames * frames, axis=1))))
+
+    a = np.clip((starts / LOUDNESS_FRAME_SECONDS).astype(int), 0, n - 1)
+    b = np.clip(np.ceil(ends / LOUDNESS_FRAME_SECONDS).astype(int), a + 1, n)
+    mean = (energy[b] - energy[a]) / (b - a)
+    return 10 * np.log10(mean + 1e-10)
+
+def segment_features(segments, audio=None):
+    """
+    Per-segment feature columns, computed over all words at once: words
+    are flattened with their segment id and summed per segment with
+    bincount.
+    """
+    n = len(segments)
+    starts = np.array([s["start"] for s in segments], dtype=np.float64)
+    ends = np.array([s["end"] for s in segments], dtype=np.float64)
+    durations = np.maximum(ends - starts, 1e-3)
+
+    counts = np.array([len(s["words"]) for s in segments])
+    seg_ids = np.repeat(np.arange(n), counts)
+    words = [w for s in segments for w in s["words"]]
+
+    w_start = np.fromiter((w["start"] for w in words), dtype=np.float64, count=len(words))
+    w_end = np.fromiter((w["end"] for w in words), dtype=np.float64, count=len(words))
+    emphasized = np.fromiter((bool(w.get("emphasized")) for w in words), dtype=np.float64, count=len(words))
+    topical = np.fromiter(
+        (normalize(w.get("word") or w.get("text", "")) in TOPIC_TOKENS for w in words),
+        dtype=np.float64, count=len(words)
+    )
+
+    safe_counts = np.maximum(counts, 1)
+
+    # gaps between consecutive words of the same segment
+    gaps = np.maximum(w_start[1:] - w_end[:-1], 0.0)
+    same = seg_ids[1:] == seg_ids[:-1]
+    pause = np.bincount(seg_ids[1:][same], weights=gaps[same], minlength=n)
+
+    lead = np.empty(n)
+    lead[0] = MAX_LEAD_PAUSE
+    lead[1:] = np.clip(starts[1:] - ends[:-1], 0.0, MAX_LEAD_PAUSE)
+
+    features = {
+        "emphasis_density": np.bincount(seg_ids, weights=emphasized, minlength=n) / safe_counts,
+        "speech_rate": counts / durations,
+        "pause_ratio": pause / durations,
+        "lead_pause": lead,
+        "topic_hits": np.bincount(seg_ids, weights=topical, minlength=n) / safe_counts,
+        "loudness": segment_loudness(audio, starts, ends) if audio is not None else np.zeros(n),
+    }
+    return starts, ends, features
+
+def score_segments(segments, audio=None, weights=WEIGHTS):
+    """
+    Weighted sum of z-scored features; returns (starts, ends, scores).
+    """
+    starts, ends, features = segment_features(segments, audio)
+    scores = np.zeros(len(segments))
+    for name, weight in weights.items():
+        col = features[name]
+        std = col.std()
+        if std > 0:
+            scores += weight * (col - col.mean()) / std
+    return starts, ends, scores
+
+# -----------------------------
+# SELECTION
+# -----------------------------
+
+def candidate_windows(starts, ends, scores, min_seconds=MIN_HIGHLIGHT_SECONDS):
+    """
+    One window per segment: it and the fewest following segments that
+    reach min_seconds. Scored by duration-weighted mean segment score
+    from prefix sums, so building all n windows is O(n log n).
+    """
+    last = np.searchsorted(ends, starts + min_seconds)
+    last = np.minimum(last, len(ends) - 1)
+
+    weighted = np.concatenate(([0.0], np.cumsum(scores * (ends - starts))))
+    spoken = np.concatenate(([0.0], np.cumsum(ends - starts)))
+    total = np.maximum(spoken[last + 1] - spoken[:len(starts)], 1e-9)
+    window_scores = (weighted[last + 1] - weighted[:len(starts)]) / total
+
+    # windows cut short by the end of the transcript rank last
+    short = ends[last] - starts < min_seconds
+    if not short.all():
+        window_scores[short] = -np.inf
+    return last, window_scores
+
+def select_highlights(segments, k=3, target_seconds=None, audio=None, min_seconds=MIN_HIGHLIGHT_SECONDS):
+    """
+    Top-k non-overlapping windows, best first, whose total length stays
+    within target_seconds. Candidates come off a heap in score order;
+    each accepted window is checked against the sorted picks by bisect.
+    """
+    if not segments:
+        return []
+
+    starts, ends, scores = score_segments(segments, audio)
+    last, window_scores = candidate_windows(starts, ends, scores, min_seconds)
+
+    heap = [(-s, i) for i, s in enumerate(window_scores.tolist())]
+    heapq.heapify(heap)
+
+    picked, spans, total = [], [], 0.0
+    while heap and len(picked) < k:
+        neg, i = heapq.heappop(heap)
+        if neg == np.inf:
+            break
+        start, end = float(starts[i]), float(ends[last[i]])
+
+        if target_seconds is not None and total + (end - start) > target_seconds:
+            continue
+
+        pos = bisect_left(spans, (start, end))
+        if pos > 0 and spans[pos - 1][1] > start:
+            continue
+        if pos < len(spans) and spans[pos][0] < end:
+            continue
+
+        spans.insert(pos, (start, end))
+        total += end - start
+        picked.append({
+            "start": start,
+            "end": end,
+            "score": round(-neg, 4),
+            "segments": list(range(i, int(last[i]) + 1)),
+        })
+
+    return picked
+
+def load_audio(path):
+    return load_wav(path) if os.path.exists(path) else None
@@ -2,6 +2,7 @@ import json
 import os
 import sys
 
+from intent_cache import cache_stats
 from intent_engine import extract_intent
 
 STATE_PATH = os.path.join(os.path.dirname(__file__), "editor_state.json")
@@ -24,6 +25,7 @@ def normalize_state(state):
     state["caption_style"].setdefault("size", "medium")
     state["caption_style"].setdefault("background", "auto")
     state["caption_style"].setdefault("animation", "subtle")
+    state["caption_style"].setdefault("mode", "static")
 
     state.setdefault("broll", {})
     state["broll"].setdefault("enabled", True)
@@ -44,6 +46,13 @@ def normalize_state(state):
     state.setdefault("captions", {})
     state["captions"].setdefault("language", "original")
 
+    state.setdefault("render", {})
+    state["render"].setdefault("profile", "final")
+
+    state.setdefault("segmentation", {})
+    state["segmentation"].setdefault("pause_threshold", 0.7)
+    state["segmentation"].setdefault("max_segment_duration", 7)
+
     return state
 
 # -----------------------------
@@ -137,5 +146,6 @@ if __name__ == "__main__":
 
     print(json.dumps({
         "intent_payload": payload,
-        "updated_state": updated_state
+        "updated_state": updated_state,
+        "intent_cache": cache_stats()
     }, indent=2))
@@ -0,0 +1,140 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+# -----------------------------
+# PATHS
+# -----------------------------
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INTENT_CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache", "intents.sqlite3")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+INTENT_CACHE_TTL = int(os.getenv("INTENT_CACHE_TTL", str(7 * 24 * 3600)))   # seconds
+INTENT_CACHE_MAX_ENTRIES = int(os.getenv("INTENT_CACHE_MAX_ENTRIES", "1000"))  # least recently used go first
+INTENT_CACHE_VERSION = 1   # bump when backends or the payload schema change
+
+# Phrasings that mean the same edit collapse to one key
+SYNONYMS = {
+    "subtitles": "captions", "subtitle": "captions", "caption": "captions",
+    "b roll": "b-roll", "broll": "b-roll", "b-rolls": "b-roll",
+    "turn off": "disable", "switch off": "disable",
+    "turn on": "enable", "switch on": "enable",
+    "animation": "animations", "overlay": "overlays",
+    "bigger": "larger", "big": "large",
+    "do not": "don't", "dont": "don't",
+}
+FILLER = {"please", "the", "a", "an", "can", "you", "could", "just", "now"}
+
+SYNONYM_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(k) for k in sorted(SYNONYMS, key=len, reverse=True)) + r")\b"
+)
+PUNCTUATION_RE = re.compile(r"[^\w\s'-]+")
+
+# -----------------------------
+# KEYS
+# -----------------------------
+
+def normalize_command(command):
+    """
+    Case-folded, punctuation-free, single-spaced command with synonyms
+    collapsed and filler words dropped.
+    """
+    text = command.casefold().replace("’", "'")
+    text = PUNCTUATION_RE.sub(" ", text)
+    text = " ".join(text.split())
+    text = SYNONYM_RE.sub(lambda m: SYNONYMS[m.group(0)], text)
+    return " ".join(w for w in text.split() if w not in FILLER)
+
+def command_key(command, backend):
+    return f"{INTENT_CACHE_VERSION}|{backend}|{normalize_command(command)}"
+
+# -----------------------------
+# STORE
+# -----------------------------
+
+def connect(path=INTENT_CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS intents ("
+        "key TEXT PRIMARY KEY, payload TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS intents_used ON intents (used)")
+    db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+    return db
+
+def _count(db, name):
+    db.execute(
+        "INSERT INTO stats (name, count) VALUES (?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET count = count + 1",
+        (name,)
+    )
+
+def load_intent(key, ttl=INTENT_CACHE_TTL, path=INTENT_CACHE_PATH):
+    """
+    Cached payload for `key`, or None when missing or older than ttl.
+    A hit refreshes its LRU position; hits and misses are counted.
+    An unreadable cache is a miss.
+    """
+    now = time.time()
+    try:
+        with closing(connect(path)) as db, db:
+            return _load(db, key, now, ttl)
+    except sqlite3.Error:
+        return None
+
+def _load(db, key, now, ttl):
+    row = db.execute("SELECT payload, created FROM intents WHERE key = ?", (key,)).fetchone()
+    if row and now - row[1] <= ttl:
+        db.execute("UPDATE intents SET used = ? WHERE key = ?", (now, key))
+        _count(db, "hits")
+        return json.loads(row[0])
+
+    if row:
+        db.execute("DELETE FROM intents WHERE key = ?", (key,))
+    _count(db, "misses")
+    return None
+
+def store_intent(key, payload, max_entries=INTENT_CACHE_MAX_ENTRIES, path=INTENT_CACHE_PATH):
+    """
+    Save a payload and evict the least recently used entries past
+    max_entries. A cache that can't be written is skipped.
+    """
+    now = time.time()
+    try:
+        with closing(connect(path)) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO intents (key, payload, created, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload), now, now)
+            )
+            db.execute(
+                "DELETE FROM intents WHERE key NOT IN "
+                "(SELECT key FROM intents ORDER BY used DESC LIMIT ?)",
+                (max_entries,)
+            )
+    except sqlite3.Error:
+        pass
+
+def cache_stats(path=INTENT_CACHE_PATH):
+    """
+    {"hits", "misses", "entries"} since the cache file was created.
+    """
+    stats, entries = {}, 0
+    if os.path.exists(path):
+        try:
+            with closing(connect(path)) as db:
+                stats = dict(db.execute("SELECT name, count FROM stats").fetchall())
+                entries = db.execute("SELECT COUNT(*) FROM intents").fetchone()[0]
+        except sqlite3.Error:
+            pass
+    return {"hits": stats.get("hits", 0), "misses": stats.get("misses", 0), "entries": entries}
+
+if __name__ == "__main__":
+    print(json.dumps(cache_stats(), indent=2))
@@ -1,11 +1,24 @@
 import os
+import sys
 import json
-from openai import OpenAI
-from dotenv import load_dotenv
+from functools import lru_cache
 
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
+from intent_cache import INTENT_CACHE_PATH, command_key, load_intent, store_intent
+from rule_intents import describe_concepts, match_intents
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+ENV_PATH = os.path.join(os.path.dirname(__file__), "..", ".env")
+
+# Backends tried in order until one is confident enough; "rules" is the
+# local matcher, "openai" the remote model (optional, needs OPENAI_API_KEY)
+INTENT_BACKENDS = [
+    b.strip() for b in os.getenv("INTENT_BACKENDS", "rules,openai").split(",") if b.strip()
+]
+
+# A result at least this confident skips the remaining backends
+FAST_PATH_CONFIDENCE = 0.9
+
+# Remember non-local backends' answers per normalized command
+INTENT_CACHE = os.getenv("INTENT_CACHE", "1") == "1"
 
 SYSTEM_PROMPT = """
 You are an AI video editor.
@@ -19,36 +32,7 @@ Return STRICT JSON ONLY. No explanations. No markdown.
 EDITOR CONCEPTS
 -----------------
 
-CAPTIONS refer to:
-- captions
-- subtitles
-- text
-- words on screen
-
-B-ROLL refers to:
-- icons
-- visuals
-- graphics
-- images
-- overlays
-- extra visuals
-- supporting visuals
-
-ANIMATIONS refer to:
-- motion
-- transitions
-- effects
-- movement
-- fade
-- slide
-- pop
-
-OVERLAYS refer to:
-- background boxes
-- caption background
-- translucent blocks
-- highlight bars
-- black background behind text
+{editor_concepts}
 
 -----------------
 OUTPUT SCHEMA
@@ -106,28 +90,99 @@ RULES
 - Use semantic meaning, not keywords
 - Omit unclear intents
 - confidence reflects overall understanding (0–1)
-"""
-
-def extract_intent(command: str) -> dict:
-    try:
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": command}
-            ],
-        )
-
-        raw = response.output_text.strip()
-        parsed = json.loads(raw)
-
-        if not isinstance(parsed.get("intents"), list):
-            raise ValueError("Invalid intent schema")
-
-        return parsed
-
-    except Exception:
-        return {
-            "intents": [],
-            "confidence": 0.0
-        }
+""".replace("{editor_concepts}", describe_concepts())
+
+# -----------------
+# BACKENDS
+# -----------------
+
+@lru_cache(maxsize=1)
+def openai_client():
+    # imported lazily so offline machines need neither package
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    load_dotenv(dotenv_path=ENV_PATH)
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def openai_backend(command: str) -> dict:
+    response = openai_client().responses.create(
+        model="gpt-4o-mini",
+        input=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": command}
+        ],
+    )
+
+    raw = response.output_text.strip()
+    parsed = json.loads(raw)
+
+    if not isinstance(parsed.get("intents"), list):
+        raise ValueError("Invalid intent schema")
+
+    return parsed
+
+def rules_backend(command: str) -> dict:
+    return match_intents(command)
+
+# name -> callable(command) -> {"intents": [...], "confidence": float}
+BACKENDS = {
+    "rules": rules_backend,
+    "openai": openai_backend,
+}
+
+# Backends cheaper than a cache lookup
+LOCAL_BACKENDS = {"rules"}
+
+def register_backend(name, backend, local=False):
+    BACKENDS[name] = backend
+    if local:
+        LOCAL_BACKENDS.add(name)
+
+def call_backend(name, command, use_cache=INTENT_CACHE, cache_path=INTENT_CACHE_PATH):
+    """
+    One backend's payload; remote answers go through the intent cache
+    at cache_path. Only payloads with intents are stored, so failures
+    are retried.
+    """
+    if name in LOCAL_BACKENDS or not use_cache:
+        return BACKENDS[name](command)
+
+    key = command_key(command, name)
+    cached = load_intent(key, path=cache_path)
+    if cached is not None:
+        return dict(cached, cached=True)
+
+    payload = BACKENDS[name](command)
+    if payload.get("intents"):
+        store_intent(key, payload, path=cache_path)
+    return payload
+
+# -----------------
+# ENTRY POINT
+# -----------------
+
+def extract_intent(command: str, backends=None, use_cache=INTENT_CACHE, cache_path=INTENT_CACHE_PATH) -> dict:
+    """
+    Run the backends in order and return the first result at or above
+    FAST_PATH_CONFIDENCE, else the most confident one. A failing backend
+    is reported on stderr and skipped.
+    """
+    best = {"intents": [], "confidence": 0.0}
+
+    for name in backends or INTENT_BACKENDS:
+        try:
+            payload = call_backend(name, command, use_cache, cache_path)
+        except Exception as e:
+            print(f"❌ Intent backend '{name}' failed: {e}", file=sys.stderr)
+            continue
+
+        payload = dict(payload, backend=name)
+        if payload.get("confidence", 0) >= FAST_PATH_CONFIDENCE:
+            return payload
+        if payload.get("confidence", 0) > best["confidence"]:
+            best = payload
+
+    return best
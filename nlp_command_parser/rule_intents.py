@@ -0,0 +1,309 @@
+import re
+
+# -----------------------------
+# VOCABULARY
+# -----------------------------
+
+# Editor concepts and the phrases that name them. SYSTEM_PROMPT lists
+# the same phrases, so the local matcher and the LLM file a word under
+# the same concept. Earlier concepts win where phrases overlap
+# ("caption background" is the caption's own background, not captions).
+CONCEPTS = [
+    ("background", "CAPTION BACKGROUND", [
+        "caption background", "captions background", "subtitle background",
+        "text background", "background behind captions",
+        "background behind the captions",
+    ]),
+    ("overlay", "OVERLAYS", [
+        "overlays", "background boxes", "translucent blocks",
+        "highlight bars", "black background behind text", "background",
+    ]),
+    ("broll", "B-ROLL", [
+        "b-roll", "icons", "visuals", "graphics", "images",
+        "extra visuals", "supporting visuals",
+    ]),
+    ("animation", "ANIMATIONS", [
+        "animations", "motion", "transitions", "effects", "movement",
+        "fade", "slide", "pop",
+    ]),
+    ("caption", "CAPTIONS", ["captions", "subtitles", "text", "words on screen"]),
+]
+
+def _phrase_pattern(phrase):
+    # optional plural, and "b-roll" also as "b roll" / "broll"
+    pattern = re.escape(phrase).replace(r"\-", "[- ]?")
+    if phrase.endswith("xes"):
+        return pattern[:-2] + "(?:es)?"
+    if phrase.endswith("s"):
+        return pattern[:-1] + "s?"
+    return pattern + "s?"
+
+def describe_concepts():
+    """
+    The concept vocabulary as the "EDITOR CONCEPTS" section of a prompt.
+    """
+    blocks = []
+    for _, title, phrases in CONCEPTS:
+        verb = "refers" if title in ("B-ROLL", "CAPTION BACKGROUND") else "refer"
+        blocks.append(f"{title} {verb} to:\n" + "\n".join(f"- {p}" for p in phrases))
+    return "\n\n".join(blocks)
+
+SUBJECTS = [
+    (name, sorted((_phrase_pattern(p) for p in phrases), key=len, reverse=True))
+    for name, _, phrases in CONCEPTS
+]
+
+# Slot words; a group name is "<kind>_<value>"
+VALUES = [
+    ("neg", [r"don'?t", r"do not", r"never", r"stop using"]),
+    ("off", [
+        r"disable", r"turn off", r"switch off", r"off", r"remove", r"hide", r"no",
+        r"without", r"get rid of", r"drop", r"kill", r"delete", r"stop",
+    ]),
+    ("on", [
+        r"enable", r"turn on", r"switch on", r"add", r"show", r"bring back",
+        r"use", r"include", r"keep", r"put",
+    ]),
+    ("style_fade", [r"fade(?:s|d)?", r"fading"]),
+    ("style_slide", [r"slides?", r"sliding"]),
+    ("style_pop", [r"pops?", r"popping"]),
+    ("size_large", [r"bigger", r"larger", r"large", r"big", r"huge", r"increase"]),
+    ("size_small", [r"smaller", r"small", r"tiny", r"decrease", r"reduce"]),
+    ("size_medium", [r"medium", r"normal size", r"regular size", r"default size"]),
+    ("level_energetic", [r"energetic", r"dynamic", r"lively", r"punchy", r"bouncy"]),
+    ("level_subtle", [r"subtle", r"calm", r"gentle", r"soft"]),
+    ("level_none", [r"none", r"static"]),
+    ("pos_left", [r"left"]),
+    ("pos_right", [r"right"]),
+    ("pos_smart", [r"smart(?:ly)?", r"wherever it fits"]),
+    ("mode_always", [r"always", r"every(?:where| segment)", r"all the time"]),
+    ("mode_auto", [r"auto(?:matic(?:ally)?)?"]),
+    ("mode_minimal", [r"minimal", r"fewer", r"less", r"rarely"]),
+    ("mode_prominent", [r"prominent", r"more visible", r"stand out", r"emphasi[sz]ed?"]),
+]
+
+def _compile(groups):
+    # one alternation of named groups, compiled once at import
+    parts = [
+        f"(?P<{name}>\\b(?:{'|'.join(patterns)})\\b)"
+        for name, patterns in groups
+    ]
+    return re.compile("|".join(parts))
+
+SUBJECT_RE = _compile(SUBJECTS)
+VALUE_RE = _compile(VALUES)
+CLAUSE_SPLIT_RE = re.compile(r"\s*(?:[,;.!]|\band\b|\bthen\b|\balso\b|\bplus\b)\s*")
+CLEAN_RE = re.compile(r"[^a-z0-9'\- ]+")
+
+# Idioms whose words would otherwise read as slots ("right now" is not a position)
+IDIOM_RE = re.compile(r"\bright (?:now|away)\b")
+
+# Words that flip or soften a slot. "don't make captions smaller" or
+# "less energetic" can't be expressed as a slot value, so clauses that
+# pair one with a size / level / position / mode stay below the floor
+NEGATION_RE = re.compile(r"\b(?:don'?t|do not|never|not|no longer|no|without|less|fewer)\b")
+NEGATABLE_SLOTS = {"size", "level", "pos", "mode"}
+
+FULL_MATCH_CONFIDENCE = 0.95   # every clause understood
+PARTIAL_MATCH_CONFIDENCE = 0.6 # floor once any clause is (still applied by apply_intents)
+UNSURE_CONFIDENCE = 0.8        # cap when a clause has words the matcher did not use
+NEGATED_CONFIDENCE = 0.5       # cap for a negated slot: not applied, left to the LLM
+
+# Words that carry no editing meaning on their own
+FILLER = {
+    "a", "an", "the", "to", "of", "on", "in", "at", "for", "with", "from", "into",
+    "it", "its", "them", "this", "that", "these", "those", "my", "our", "your",
+    "i", "we", "you", "me", "us", "please", "can", "could", "would", "should",
+    "want", "like", "make", "set", "change", "move", "let", "lets", "let's",
+    "be", "is", "are", "more", "much", "bit", "little", "very", "too", "so",
+    "just", "now", "again", "all", "some", "any", "style", "size", "video",
+    "turn", "switch", "bring", "back",
+}
+
+# -----------------------------
+# MATCHING
+# -----------------------------
+
+def _scan(regex, text):
+    return {m.lastgroup for m in regex.finditer(text)}
+
+def _value(values, kind):
+    for v in values:
+        if v.startswith(kind + "_"):
+            return v[len(kind) + 1:]
+    return None
+
+def _switch(values):
+    """
+    True / False for an on/off verb (a negated "on" is off), else None.
+    """
+    if "off" in values or ("neg" in values and "on" in values):
+        return False
+    if "on" in values:
+        return True
+    return None
+
+SWITCH_WORDS = {"neg", "off", "on"}
+
+def clause_intents(subjects, values):
+    """
+    Intents for one clause from the concepts and slot words it mentions,
+    plus the concepts and slot words they were built from.
+    """
+    switch = _switch(values)
+    style = _value(values, "style")
+    size = _value(values, "size")
+    level = _value(values, "level")
+    pos = _value(values, "pos")
+    mode = _value(values, "mode")
+    intents, used = [], set()
+
+    def add(intent, **slots):
+        intents.append({"intent": intent, "slots": slots})
+
+    def use(*kinds):
+        used.update(v for v in values if v in kinds or v.split("_")[0] in kinds)
+
+    if "background" in subjects:
+        if mode in ("always", "auto"):
+            add("CAPTION_BACKGROUND_CHANGE", background=mode)
+            use("mode")
+            if switch:
+                use(*SWITCH_WORDS)   # "always show the caption background"
+        elif switch is not None:
+            add("CAPTION_BACKGROUND_CHANGE", background="always" if switch else "never")
+            use(*SWITCH_WORDS)
+        used.add("background")
+        return intents, used
+
+    if "caption" in subjects and ("animation" in subjects or level):
+        if level or switch is False:
+            add("CAPTION_ANIMATION_CHANGE", animation=level or "none")
+            use("level", *SWITCH_WORDS)
+        used.update({"caption", "animation"})
+        return intents, used
+
+    if "animation" in subjects or (style and not subjects):
+        # "remove the fade" turns animations off; it never picks a style
+        if switch is False:
+            add("ANIMATION_ENABLE_DISABLE", enabled=False)
+            use("style", *SWITCH_WORDS)
+        else:
+            if switch:
+                add("ANIMATION_ENABLE_DISABLE", enabled=True)
+                use(*SWITCH_WORDS)
+            if style:
+                add("ANIMATION_STYLE_CHANGE", style=style)
+                use("style")
+        used.add("animation")
+        return intents, used
+
+    if "broll" in subjects:
+        if pos:
+            add("BROLL_POSITION_CHANGE", position=pos)
+            use("pos")
+        if mode == "prominent" or size == "large":
+            add("BROLL_VISIBILITY_CHANGE", visibility="prominent")
+            use("mode", "size")
+        elif mode == "auto":
+            add("BROLL_VISIBILITY_CHANGE", visibility="auto")
+            use("mode")
+        if switch is not None and not intents:
+            add("BROLL_ENABLE_DISABLE", enabled=switch)
+            use(*SWITCH_WORDS)
+        elif switch:
+            use(*SWITCH_WORDS)   # "put the icons on the left"
+        used.add("broll")
+        return intents, used
+
+    if "overlay" in subjects:
+        if mode in ("always", "auto", "minimal"):
+            add("OVERLAY_MODE_CHANGE", mode=mode)
+            use("mode")
+            if switch:
+                use(*SWITCH_WORDS)   # "always show overlays"
+        elif switch is not None:
+            add("OVERLAY_ENABLE_DISABLE", enabled=switch)
+            use(*SWITCH_WORDS)
+        used.add("overlay")
+        return intents, used
+
+    if "caption" in subjects and size:
+        add("CAPTION_SIZE_CHANGE", size=size)
+        use("size")
+        if switch:
+            use(*SWITCH_WORDS)   # "use small subtitles"
+        used.add("caption")
+
+    return intents, used
+
+def _leftover(clause):
+    """
+    Words of a clause outside every concept and slot phrase, less filler.
+    """
+    rest = VALUE_RE.sub(" ", SUBJECT_RE.sub(" ", clause))
+    return [w for w in rest.split() if w.strip("'-") and w not in FILLER]
+
+def _negated(clause, values):
+    """
+    True when a negating or softening word shares a clause with a slot
+    that has no "off" value. "less" / "fewer" on their own are the
+    minimal mode ("fewer overlays").
+    """
+    slots = {v for v in values if v.split("_")[0] in NEGATABLE_SLOTS and v != "mode_minimal"}
+    return bool(slots and NEGATION_RE.search(clause))
+
+def split_clauses(command):
+    """
+    Clauses of a command, split on punctuation and "and" / "then" before
+    the punctuation is cleaned away, each cleaned on its own.
+    """
+    text = command.lower().replace("’", "'")
+    clauses = (IDIOM_RE.sub(" ", CLEAN_RE.sub(" ", c)) for c in CLAUSE_SPLIT_RE.split(text))
+    return [" ".join(c.split()) for c in clauses if c.strip()]
+
+def match_intents(command):
+    """
+    Deterministic intent payload for a command, in the LLM's schema.
+    Clauses split on punctuation / "and" / "then"; a clause that names
+    only a concept reuses the previous clause's verb ("turn off captions
+    and b-roll"). Confidence grows with the share of clauses that produced
+    an intent, stays below the fast path when any clause has words the
+    matcher ignored, and below the apply floor when a slot is negated,
+    so the LLM gets a say.
+    """
+    clauses = split_clauses(command)
+
+    found = {}
+    matched = 0
+    unsure = negated = False
+    values = set()
+    for clause in clauses:
+        subjects = _scan(SUBJECT_RE, clause)
+        clause_values = _scan(VALUE_RE, clause)
+        values = clause_values or values
+        if _negated(clause, clause_values):
+            negated = True
+
+        intents, used = clause_intents(subjects, values)
+        if intents:
+            matched += 1
+        if (subjects | clause_values) - used or _leftover(clause):
+            unsure = True
+        for item in intents:
+            found[item["intent"]] = item   # a later clause wins
+
+    if not clauses or not matched:
+        return {"intents": [], "confidence": 0.0}
+
+    share = matched / len(clauses)
+    span = FULL_MATCH_CONFIDENCE - PARTIAL_MATCH_CONFIDENCE
+    confidence = PARTIAL_MATCH_CONFIDENCE + span * share
+    if unsure:
+        confidence = min(confidence, UNSURE_CONFIDENCE)
+    if negated:
+        confidence = min(confidence, NEGATED_CONFIDENCE)
+    return {
+        "intents": list(found.values()),
+        "confidence": round(confidence, 2),
+    }
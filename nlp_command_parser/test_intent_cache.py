@@ -0,0 +1,125 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import intent_cache
+from intent_cache import cache_stats, command_key, load_intent, normalize_command, store_intent
+from intent_engine import BACKENDS, extract_intent, register_backend
+from rule_intents import match_intents
+
+# -----------------------------
+# FIXTURES
+# -----------------------------
+
+@pytest.fixture
+def remote(tmp_path):
+    """
+    A counting stand-in for a remote model, registered as a non-local
+    backend, and a cache file of its own under tmp_path.
+    """
+    calls = []
+
+    def backend(command):
+        calls.append(command)
+        return match_intents(command)
+
+    register_backend("fake", backend)
+    yield calls, str(tmp_path / "intents.sqlite3")
+    BACKENDS.pop("fake", None)
+
+def ask(command, cache_path):
+    return extract_intent(command, backends=["fake"], use_cache=True, cache_path=cache_path)
+
+# -----------------------------
+# HITS AND MISSES
+# -----------------------------
+
+def test_second_call_is_a_hit(remote):
+    calls, path = remote
+    first = ask("disable b-roll", path)
+    second = ask("disable b-roll", path)
+
+    assert calls == ["disable b-roll"]
+    assert "cached" not in first and second["cached"] is True
+    assert second["intents"] == first["intents"]
+    assert cache_stats(path) == {"hits": 1, "misses": 1, "entries": 1}
+
+def test_empty_payloads_are_not_stored(remote):
+    calls, path = remote
+    ask("what a lovely day", path)
+    ask("what a lovely day", path)
+
+    assert len(calls) == 2
+    assert cache_stats(path)["entries"] == 0
+
+def test_default_cache_is_untouched(remote):
+    _, path = remote
+    default = intent_cache.INTENT_CACHE_PATH
+    before = os.stat(default).st_mtime_ns if os.path.exists(default) else None
+
+    ask("disable b-roll", path)
+
+    assert os.path.exists(path)
+    assert (os.stat(default).st_mtime_ns if os.path.exists(default) else None) == before
+
+# -----------------------------
+# EXPIRY AND EVICTION
+# -----------------------------
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    path = str(tmp_path / "intents.sqlite3")
+    now = [1000.0]
+    monkeypatch.setattr(intent_cache.time, "time", lambda: now[0])
+
+    store_intent("k", {"intents": [1]}, path=path)
+    now[0] += 10
+    assert load_intent("k", ttl=10, path=path) == {"intents": [1]}
+    now[0] += 1
+    assert load_intent("k", ttl=10, path=path) is None
+    assert cache_stats(path)["entries"] == 0
+
+def test_least_recently_used_is_evicted(tmp_path, monkeypatch):
+    path = str(tmp_path / "intents.sqlite3")
+    now = [1000.0]
+    monkeypatch.setattr(intent_cache.time, "time", lambda: now[0])
+
+    for key in ("a", "b"):
+        store_intent(key, {"intents": [key]}, max_entries=2, path=path)
+        now[0] += 1
+    load_intent("a", path=path)   # "b" is now the least recently used
+    now[0] += 1
+    store_intent("c", {"intents": ["c"]}, max_entries=2, path=path)
+
+    assert load_intent("b", path=path) is None
+    assert load_intent("a", path=path) == {"intents": ["a"]}
+    assert load_intent("c", path=path) == {"intents": ["c"]}
+
+# -----------------------------
+# NORMALIZATION
+# -----------------------------
+
+@pytest.mark.parametrize("a, b", [
+    ("Turn off the subtitles, please", "disable captions"),
+    ("switch on B-Roll!", "enable broll"),
+    ("Do not show the overlay", "don't show overlays"),
+    ("make   captions BIGGER", "make captions larger"),
+])
+def test_equivalent_phrasings_share_a_key(a, b):
+    assert command_key(a, "openai") == command_key(b, "openai")
+
+@pytest.mark.parametrize("a, b", [
+    ("enable captions", "disable captions"),
+    ("show b-roll", "don't show b-roll"),
+    ("make captions smaller", "make captions larger"),
+    ("put b-roll on the left", "put b-roll on the right"),
+])
+def test_different_edits_never_collide(a, b):
+    assert normalize_command(a) != normalize_command(b)
+
+def test_backends_have_separate_keys():
+    assert command_key("disable captions", "openai") != command_key("disable captions", "other")
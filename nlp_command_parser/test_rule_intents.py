@@ -0,0 +1,84 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from rule_intents import NEGATED_CONFIDENCE, PARTIAL_MATCH_CONFIDENCE, match_intents
+
+# -----------------------------
+# EXPECTED PAYLOADS
+# -----------------------------
+# (command, {intent: slots}, minimum confidence). Every allowed intent
+# appears at least once.
+
+CONFIDENT = [
+    ("make captions bigger", {"CAPTION_SIZE_CHANGE": {"size": "large"}}, 0.9),
+    ("use small subtitles", {"CAPTION_SIZE_CHANGE": {"size": "small"}}, 0.9),
+    ("remove the caption background", {"CAPTION_BACKGROUND_CHANGE": {"background": "never"}}, 0.9),
+    ("always show the caption background", {"CAPTION_BACKGROUND_CHANGE": {"background": "always"}}, 0.9),
+    ("subtitle background automatic", {"CAPTION_BACKGROUND_CHANGE": {"background": "auto"}}, 0.9),
+    ("make the captions energetic", {"CAPTION_ANIMATION_CHANGE": {"animation": "energetic"}}, 0.9),
+    ("make b-roll more prominent", {"BROLL_VISIBILITY_CHANGE": {"visibility": "prominent"}}, 0.9),
+    ("put the icons on the left", {"BROLL_POSITION_CHANGE": {"position": "left"}}, 0.9),
+    ("disable b-roll", {"BROLL_ENABLE_DISABLE": {"enabled": False}}, 0.9),
+    ("right now disable b-roll", {"BROLL_ENABLE_DISABLE": {"enabled": False}}, 0.9),
+    ("turn on animations", {"ANIMATION_ENABLE_DISABLE": {"enabled": True}}, 0.9),
+    ("remove the fade", {"ANIMATION_ENABLE_DISABLE": {"enabled": False}}, 0.9),
+    ("use slide animations", {
+        "ANIMATION_ENABLE_DISABLE": {"enabled": True},
+        "ANIMATION_STYLE_CHANGE": {"style": "slide"},
+    }, 0.9),
+    ("disable overlays", {"OVERLAY_ENABLE_DISABLE": {"enabled": False}}, 0.9),
+    ("fewer overlays", {"OVERLAY_MODE_CHANGE": {"mode": "minimal"}}, 0.9),
+    # clauses split on punctuation before it is cleaned away
+    ("disable b-roll. enable animations", {
+        "BROLL_ENABLE_DISABLE": {"enabled": False},
+        "ANIMATION_ENABLE_DISABLE": {"enabled": True},
+    }, 0.9),
+    ("no slide, use fade", {
+        "ANIMATION_ENABLE_DISABLE": {"enabled": True},
+        "ANIMATION_STYLE_CHANGE": {"style": "fade"},
+    }, 0.9),
+    ("hide the icons; show overlays always", {
+        "BROLL_ENABLE_DISABLE": {"enabled": False},
+        "OVERLAY_MODE_CHANGE": {"mode": "always"},
+    }, 0.9),
+]
+
+# Negated or softened slots can't be expressed as a slot value, so they
+# must stay below apply_intents' floor
+NEGATED = [
+    "don't make captions smaller",
+    "make captions less energetic",
+    "don't put b-roll on the left",
+    "no b-roll on the right",
+    "never make the captions large",
+]
+
+def intents_of(payload):
+    return {item["intent"]: item["slots"] for item in payload["intents"]}
+
+# -----------------------------
+# TESTS
+# -----------------------------
+
+@pytest.mark.parametrize("command, expected, min_confidence", CONFIDENT)
+def test_expected_payload(command, expected, min_confidence):
+    payload = match_intents(command)
+    assert intents_of(payload) == expected
+    assert payload["confidence"] >= min_confidence
+
+@pytest.mark.parametrize("command", NEGATED)
+def test_negated_slots_are_not_applied(command):
+    payload = match_intents(command)
+    assert payload["confidence"] <= NEGATED_CONFIDENCE < PARTIAL_MATCH_CONFIDENCE
+
+def test_unknown_command():
+    assert match_intents("what a lovely day") == {"intents": [], "confidence": 0.0}
+
+def test_unused_words_stay_below_fast_path():
+    assert match_intents("disable b-roll when the speaker pauses")["confidence"] < 0.9
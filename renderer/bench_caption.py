@@ -0,0 +1,117 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from renderer.glyph_atlas import load_font
+from renderer.render import (
+    CAPTION_FONT_SIZE, COLORS, FONT_BOLD, PADDING, draw_bg, layout_caption, render_caption
+)
+
+# -----------------------------
+# REFERENCE
+# -----------------------------
+# The caption drawing before linear layout: every word re-measures the
+# joined line, and emphasis is looked up by spelling across all words.
+
+def reference_wrap(words, max_width):
+    font = load_font(FONT_BOLD, CAPTION_FONT_SIZE)
+    d = ImageDraw.Draw(Image.new("RGBA", (10, 10)))
+
+    lines, current = [], []
+    for w in words:
+        t = w.get("word") or w.get("text")
+        if not t:
+            continue
+        test = " ".join(current + [t])
+        if d.textlength(test, font) < max_width:
+            current.append(t)
+        else:
+            lines.append(current)
+            current = [t]
+    if current:
+        lines.append(current)
+    return lines
+
+def reference_caption(words, width, decision):
+    font = load_font(FONT_BOLD, CAPTION_FONT_SIZE)
+    d = ImageDraw.Draw(Image.new("RGBA", (10, 10)))
+    lines = reference_wrap(words, width - 200)
+
+    use_bg = decision.get("title") or decision.get("overlay") or len(lines) > 1
+
+    line_h = 48
+    text_w = max(int(d.textlength(" ".join(l), font)) for l in lines)
+    img_w = text_w + PADDING * 2
+    img_h = len(lines) * line_h + PADDING * 2
+
+    img = Image.new("RGBA", (img_w, img_h), (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+
+    if use_bg:
+        draw_bg(d, img_w, img_h, strong=decision.get("title") or decision.get("overlay"))
+
+    y = PADDING
+    for ln in lines:
+        x = (img_w - int(d.textlength(" ".join(ln), font))) // 2
+        for word in ln:
+            color = COLORS["accent"] if any(
+                ww.get("emphasized") and ww.get("word") == word for ww in words
+            ) else COLORS["text"]
+            d.text((x, y), word + " ", font=font, fill=color)
+            x += int(font.getlength(word + " "))
+        y += line_h
+
+    return img
+
+# -----------------------------
+# BENCHMARK
+# -----------------------------
+# Caption layout and full caption rasterization, old vs current, on
+# segments of growing length (a 7 s segment can hold dozens of words).
+# Usage: python renderer/bench_caption.py [--words 10 30 60 120]
+
+VOCAB = (
+    "so the main idea is that every video already has its structure in the voice "
+    "pauses emphasis captions animations overlays automatically important remember"
+).split()
+
+def random_words(n, seed=0):
+    rng = random.Random(seed)
+    return [{"word": rng.choice(VOCAB), "emphasized": rng.random() < 0.15} for _ in range(n)]
+
+def per_call_ms(fn, *args, repeat=20):
+    fn(*args)   # warm font and glyph caches
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark caption layout and rasterization")
+    parser.add_argument("--words", type=int, nargs="+", default=[10, 30, 60, 120])
+    parser.add_argument("--width", type=int, default=1280, help="video width")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    decision = {"overlay": True}
+    print(f"ℹ️ {args.width}px wide captions, ms per caption (mean of warm runs)")
+    print(f"{'words':>6} {'wrap old':>9} {'wrap new':>9} {'draw old':>9} {'draw new':>9}")
+    for n in args.words:
+        words = random_words(n)
+        wrap_old = per_call_ms(reference_wrap, words, args.width - 200, repeat=args.repeat)
+        wrap_new = per_call_ms(layout_caption, words, args.width - 200, repeat=args.repeat)
+        draw_old = per_call_ms(reference_caption, words, args.width, decision, repeat=args.repeat)
+        draw_new = per_call_ms(render_caption, words, args.width, decision, repeat=args.repeat)
+        print(f"{n:>6} {wrap_old:>9.2f} {wrap_new:>9.2f} {draw_old:>9.2f} {draw_new:>9.2f}")
+
+if __name__ == "__main__":
+    main()
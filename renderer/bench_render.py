@@ -0,0 +1,88 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from caption_engine.captions import SEGMENTS_PATH, build_captions
+from renderer.profiles import probe
+from renderer.render import DECISIONS_PATH, load_json, render
+
+# -----------------------------
+# BENCHMARK
+# -----------------------------
+# Full (non-incremental) renders of the checked-in segments and decisions,
+# timed per worker count or per compositing backend. Without a video a
+# synthetic 720p clip is made.
+# Usage: python renderer/bench_render.py [--video raw.mp4] [--workers 1 2 4 8]
+#        python renderer/bench_render.py --backends moviepy ffmpeg
+
+def make_test_clip(path, seconds, size="1280x720", fps=30):
+    subprocess.run([
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", path
+    ], check=True)
+
+def timeline(seconds):
+    """
+    Captions and decisions that start within the first `seconds`.
+    """
+    captions = [c for c in build_captions(load_json(SEGMENTS_PATH)) if c["start"] < seconds]
+    decisions = [d for d in load_json(DECISIONS_PATH) if d["start"] < seconds]
+    return captions, decisions
+
+def timed_render(captions, decisions, video, out_path, **options):
+    started = time.perf_counter()
+    render(captions, decisions, video, out_path, incremental=False, **options)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full renders across worker counts or backends")
+    parser.add_argument("--video", help="source video (default: synthetic test clip)")
+    parser.add_argument("--seconds", type=float, default=20.0, help="length of the synthetic clip")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backends", nargs="+", choices=["moviepy", "ffmpeg"],
+                        help="compare compositing backends (one worker) instead of worker counts")
+    parser.add_argument("--profile", default="final")
+    args = parser.parse_args()
+
+    if args.backends:
+        runs = [(backend, {"backend": backend, "workers": 1}) for backend in args.backends]
+    else:
+        runs = [(f"{w} worker(s)", {"backend": "moviepy", "workers": w}) for w in args.workers]
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_render_")
+    try:
+        video = args.video
+        if not video:
+            video = os.path.join(tmp_dir, "clip.mp4")
+            make_test_clip(video, args.seconds)
+        _, _, fps, duration = probe(video)
+        captions, decisions = timeline(duration)
+
+        results = []
+        for i, (label, options) in enumerate(runs):
+            out_path = os.path.join(tmp_dir, f"out_{i}.mp4")
+            seconds = timed_render(captions, decisions, video, out_path, profile=args.profile, **options)
+            results.append((label, seconds))
+
+        print(f"\nℹ️ {duration:.1f}s clip, {len(captions)} captions, {os.cpu_count()} CPUs, profile {args.profile}")
+        base_label, base = results[0]
+        for label, seconds in results:
+            print(f"⏱️ {label:<12} {seconds:6.2f}s  {duration * fps / seconds:6.1f} fps  "
+                  f"{duration / seconds:5.2f}x realtime  {base / seconds:4.2f}x vs {base_label}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
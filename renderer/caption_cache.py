@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+
+from PIL import Image
+
+# ==================== PATHS ====================
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CAPTION_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "captions")
+
+# ==================== CONFIG ====================
+
+CAPTION_CACHE_MAX_BYTES = 256 * 1024 ** 2  # least recently used bitmaps go first
+
+# ==================== KEYS ====================
+
+def caption_key(words, width, decision, font, size, style):
+    """
+    Hash of everything that affects a caption bitmap: each word's text
+    and emphasis, the decision flags, font, size, video width and the
+    style constants (colours, padding, radius).
+    """
+    parts = {
+        "words": [
+            [w.get("word") or w.get("text"), bool(w.get("emphasized"))]
+            for w in words
+        ],
+        "title": bool(decision.get("title")),
+        "overlay": bool(decision.get("overlay")),
+        "font": font,
+        "size": size,
+        "width": width,
+        "style": style,
+    }
+    blob = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+def caption_path(key):
+    return os.path.join(CAPTION_CACHE_DIR, f"{key}.png")
+
+# ==================== LOOKUP ====================
+
+def load_caption(key):
+    """
+    Cached bitmap for `key`, or None. A hit refreshes its LRU position.
+    """
+    path = caption_path(key)
+    try:
+        with Image.open(path) as img:
+            img.load()
+            os.utime(path)
+            return img.convert("RGBA")
+    except OSError:
+        return None
+
+def store_caption(key, img):
+    os.makedirs(CAPTION_CACHE_DIR, exist_ok=True)
+    path = caption_path(key)
+    img.save(path + ".part.png")
+    os.replace(path + ".part.png", path)
+
+def prune_caption_cache(max_bytes=CAPTION_CACHE_MAX_BYTES):
+    """
+    Evict the least recently used bitmaps until the cache fits in max_bytes.
+    """
+    if not os.path.isdir(CAPTION_CACHE_DIR):
+        return
+
+    entries = []
+    for name in os.listdir(CAPTION_CACHE_DIR):
+        path = os.path.join(CAPTION_CACHE_DIR, name)
+        st = os.stat(path)
+        entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+
+from file_hashes import content_hash
+from visual_decision_engine.intervals import overlapping
+
+# ==================== PATHS ====================
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CHUNK_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "render_chunks")
+
+# ==================== CONFIG ====================
+
+MAX_CHUNK_SECONDS = 10                 # long gaps are split so edits stay local
+CHUNK_CACHE_MAX_BYTES = 2 * 1024 ** 3  # least recently used chunks go first
+
+# ==================== SPANS ====================
+
+def plan_spans(captions, duration, fps, max_seconds=MAX_CHUNK_SECONDS):
+    """
+    Cut the timeline at every caption start/end and split anything longer
+    than max_seconds. Spans are [first_frame, end_frame) so each chunk
+    starts on a frame boundary (and therefore on its own keyframe).
+    """
+    total = int(round(duration * fps))
+    cuts = {0, total}
+    for seg in captions:
+        for t in (seg["start"], seg["end"]):
+            frame = int(round(t * fps))
+            if 0 < frame < total:
+                cuts.add(frame)
+
+    edges = sorted(cuts)
+    step = max(1, int(max_seconds * fps))
+    spans = []
+    for a, b in zip(edges, edges[1:]):
+        for start in range(a, b, step):
+            spans.append((start, min(start + step, b)))
+    return spans
+
+def split_spans(total_frames, parts):
+    """
+    `parts` near-equal spans covering [0, total_frames).
+    """
+    parts = max(1, min(parts, total_frames))
+    edges = [total_frames * i // parts for i in range(parts + 1)]
+    return [(a, b) for a, b in zip(edges, edges[1:])]
+
+def overlays_in_span(overlays, span, fps, index=None):
+    """
+    Overlays visible on at least one frame of the span. Pass an
+    interval_index of the overlays to look them up by bisection instead
+    of scanning the list for every span.
+    """
+    first, last = span[0] / fps, (span[1] - 1) / fps
+    if index is None:
+        return [o for o in overlays if o["start"] <= last and o["end"] > first]
+    return [overlays[i] for i in overlapping(index, first, last)]
+
+# ==================== KEYS ====================
+
+def source_id(video_path):
+    """
+    Identity of the source video: its content hash (memoized on size and
+    mtime), so a rewritten or touched but unchanged file keeps its chunks.
+    """
+    return content_hash(video_path)
+
+def span_key(source, span, fps, overlays, settings):
+    """
+    Hash of everything that affects a chunk's pixels: the source range,
+    each overlay's bitmap digest, timing and placement relative to the
+    span, and the encoder settings.
+    """
+    t0 = span[0] / fps
+    parts = {
+        "source": source,
+        "span": list(span),
+        "fps": fps,
+        "settings": settings,
+        "overlays": [
+            {
+                "kind": o["kind"],
+                "digest": o["digest"],
+                "start": round(o["start"] - t0, 4),
+                "end": round(o["end"] - t0, 4),
+                "x": o.get("x"),
+                "y": o.get("y"),
+            }
+            for o in overlays
+        ],
+    }
+    blob = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+def chunk_path(key):
+    return os.path.join(CHUNK_CACHE_DIR, f"{key}.mp4")
+
+# ==================== ASSEMBLY ====================
+
+def concat_chunks(chunk_paths, audio_source, output_path):
+    """
+    Join encoded chunks with ffmpeg's concat demuxer (no video re-encode)
+    and mux the source audio back in.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        for path in chunk_paths:
+            f.write(f"file '{path}'\n")
+        list_path = f.name
+
+    command = [
+        "ffmpeg",
+        "-y",
+        "-loglevel", "error",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", list_path,
+        "-i", audio_source,
+        "-map", "0:v",
+        "-map", "1:a?",
+        "-c:v", "copy",
+        "-c:a", "aac",
+        "-shortest",
+        output_path
+    ]
+
+    try:
+        subprocess.run(command, check=True)
+    finally:
+        os.remove(list_path)
+
+def prune_chunk_cache(keep, max_bytes=CHUNK_CACHE_MAX_BYTES):
+    """
+    Touch the chunks used by this render, then evict the least recently
+    used ones until the cache fits in max_bytes.
+    """
+    keep = set(keep)
+    for path in keep:
+        os.utime(path)
+
+    entries = []
+    for name in os.listdir(CHUNK_CACHE_DIR):
+        path = os.path.join(CHUNK_CACHE_DIR, name)
+        st = os.stat(path)
+        entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path not in keep:
+            os.remove(path)
+            total -= size
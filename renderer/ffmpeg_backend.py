@@ -0,0 +1,145 @@
+import os
+import subprocess
+
+from renderer.profiles import get_profile, x264_args
+from renderer.render import (
+    BROLL_FADE_IN, BROLL_FADE_OUT, BROLL_SLIDE, BROLL_SLIDE_DISTANCE,
+    CAPTION_FADE_IN, CAPTION_FADE_OUT, CAPTION_SLIDE, CAPTION_SLIDE_OFFSET
+)
+
+# ==================== PATHS ====================
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+OVERLAY_PNG_DIR = os.path.join(PROJECT_ROOT, ".cache", "overlay_png")
+
+# ==================== CONFIG ====================
+
+OVERLAY_PNG_MAX_BYTES = 256 * 1024 ** 2  # least recently used bitmaps go first
+
+# ==================== HELPERS ====================
+
+def overlay_png(ov):
+    """
+    Write an overlay bitmap once; later renders reuse it by digest.
+    """
+    os.makedirs(OVERLAY_PNG_DIR, exist_ok=True)
+    path = os.path.join(OVERLAY_PNG_DIR, f"{ov['digest']}.png")
+    if os.path.exists(path):
+        os.utime(path)
+    else:
+        ov["image"].save(path + ".part.png")
+        os.replace(path + ".part.png", path)
+    return path
+
+def prune_overlay_pngs(keep, max_bytes=OVERLAY_PNG_MAX_BYTES):
+    """
+    Evict the least recently used bitmaps until the cache fits in
+    max_bytes, never the ones the current render reads.
+    """
+    if not os.path.isdir(OVERLAY_PNG_DIR):
+        return
+
+    keep = set(keep)
+    entries = []
+    for name in os.listdir(OVERLAY_PNG_DIR):
+        path = os.path.join(OVERLAY_PNG_DIR, name)
+        st = os.stat(path)
+        entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path not in keep:
+            os.remove(path)
+            total -= size
+
+def _num(x):
+    return f"{x:.4f}".rstrip("0").rstrip(".")
+
+def overlay_filters(ov, index, source, target):
+    """
+    Filter chain for one overlay: colour fades like moviepy's fadein /
+    fadeout, shifted onto the timeline, then an `overlay` enabled only
+    while the overlay is on screen with the slide expressed in `t`.
+    The alpha plane is split off first because ffmpeg's `fade` would
+    fade it too, while moviepy only fades the colour towards black.
+    """
+    start, end = ov["start"], ov["end"]
+    dur = end - start
+    scale = ov.get("scale", 1)
+
+    if ov["kind"] == "caption":
+        fade_in, fade_out = CAPTION_FADE_IN, CAPTION_FADE_OUT
+        x = "(W-w)/2"
+        y = f"{_num(ov['y'])}+{_num(CAPTION_SLIDE_OFFSET * scale)}*(1-min(t-{_num(start)},{CAPTION_SLIDE})/{CAPTION_SLIDE})"
+    else:
+        fade_in, fade_out = BROLL_FADE_IN, BROLL_FADE_OUT
+        x = f"{_num(ov['x'])}+(1-min(t-{_num(start)},{BROLL_SLIDE})/{BROLL_SLIDE})*{_num(BROLL_SLIDE_DISTANCE * scale)}"
+        y = _num(ov["y"])
+
+    label = f"ov{index}"
+    prepare = (
+        f"[{index}:v]format=rgba,split[{label}c][{label}a];"
+        f"[{label}a]alphaextract[{label}m];"
+        f"[{label}c]fade=t=in:st=0:d={fade_in},"
+        f"fade=t=out:st={_num(max(dur - fade_out, 0))}:d={fade_out}[{label}f];"
+        f"[{label}f][{label}m]alphamerge,"
+        f"setpts=PTS-STARTPTS+{_num(start)}/TB[{label}]"
+    )
+    blend = (
+        f"[{source}][{label}]overlay="
+        f"x='{x}':y='{y}':"
+        f"enable='gte(t,{_num(start)})*lt(t,{_num(end)})':"
+        f"eof_action=pass[{target}]"
+    )
+    return prepare, blend
+
+# ==================== RENDER ====================
+
+def render_overlays_ffmpeg(video_path, overlays, fps, output_path, profile=None, resolution=None):
+    """
+    Composite every overlay in a single ffmpeg filter_complex so all
+    per-frame work (fades, slides, alpha blending) runs in native code.
+    `resolution` is (height, width) for a downscaled render.
+    """
+    profile = profile or get_profile()
+    command = ["ffmpeg", "-y", "-loglevel", "error", "-stats", "-i", video_path]
+    graph = []
+    source = "0:v"
+    pngs = []
+
+    if resolution:
+        graph.append(f"[0:v]scale={resolution[1]}:{resolution[0]}[v0]")
+        source = "v0"
+
+    for i, ov in enumerate(overlays, 1):
+        pngs.append(overlay_png(ov))
+        command += [
+            "-loop", "1",
+            "-framerate", _num(fps),
+            "-t", _num(ov["end"] - ov["start"]),
+            "-i", pngs[-1],
+        ]
+        target = f"v{i}"
+        graph.extend(overlay_filters(ov, i, source, target))
+        source = target
+
+    if not graph:
+        graph.append("[0:v]null[v0]")
+        source = "v0"
+
+    command += [
+        "-filter_complex", ";".join(graph),
+        "-map", f"[{source}]",
+        "-map", "0:a?",
+        *x264_args(profile),
+        "-r", _num(fps),
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        output_path
+    ]
+
+    prune_overlay_pngs(pngs)
+    subprocess.run(command, check=True)
+    return output_path
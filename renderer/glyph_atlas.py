@@ -0,0 +1,157 @@
+from functools import lru_cache
+
+import numpy as np
+from PIL import ImageFont
+
+# ==================== FONTS ====================
+
+@lru_cache(maxsize=None)
+def load_font(path, size):
+    """
+    Fonts are parsed once per process and shared by every caption. Always
+    the basic layout engine: the atlas places glyphs by advance width, so
+    raqm shaping (kerning, ligatures) on Pillow builds that have it would
+    make it drift from ImageDraw.text. Every PIL font in the renderer
+    comes from here, so both paths lay text out the same way.
+    """
+    return ImageFont.truetype(path, size, layout_engine=ImageFont.Layout.BASIC)
+
+# ==================== GLYPH ATLAS ====================
+#
+# Every glyph is rasterized once into an 8-bit coverage mask, and every
+# word is assembled from those masks once; captions are then built by
+# array slicing and blending. The arithmetic mirrors PIL's text drawing
+# exactly, so the bitmaps match ImageDraw.text byte for byte.
+
+def _div255(x):
+    x = x + 128
+    return ((x >> 8) + x) >> 8
+
+@lru_cache(maxsize=None)
+def glyph(ch, path, size):
+    """
+    (coverage mask, x offset, y offset) of one glyph drawn at pen 0.
+    """
+    mask, (ox, oy) = load_font(path, size).getmask2(ch, "L")
+    w, h = mask.size
+    if w == 0 or h == 0:
+        return None
+    return np.asarray(mask, dtype=np.uint8).reshape(h, w), ox, oy
+
+@lru_cache(maxsize=65536)
+def word_mask(text, path, size):
+    """
+    (coverage mask, x offset, y offset) of a whole word. Glyphs sit at
+    their pen position rounded to the pixel grid and overlapping
+    coverage is combined as FreeType renders it into PIL's mask:
+    src + dst * (255 - src) / 255.
+    """
+    font = load_font(path, size)
+    placed = []
+    for k, ch in enumerate(text):
+        g = glyph(ch, path, size)
+        if g is None:
+            continue
+        mask, ox, oy = g
+        pen = int(font.getlength(text[:k]) + 0.5)
+        placed.append((mask, pen + ox, oy))
+
+    if not placed:
+        return None
+
+    x0 = min(x for _, x, _ in placed)
+    y0 = min(y for _, _, y in placed)
+    x1 = max(x + m.shape[1] for m, x, _ in placed)
+    y1 = max(y + m.shape[0] for m, _, y in placed)
+
+    out = np.zeros((y1 - y0, x1 - x0), dtype=np.int32)
+    for mask, x, y in placed:
+        region = out[y - y0:y - y0 + mask.shape[0], x - x0:x - x0 + mask.shape[1]]
+        src = mask.astype(np.int32)
+        region[...] = src + _div255(region * (255 - src))
+
+    out = out.astype(np.uint8)
+    out.setflags(write=False)
+    return out, x0, y0
+
+# ==================== BLENDING ====================
+
+def blend_mask(dst, mask, x, y, ink):
+    """
+    Fill `ink` through an 8-bit mask into an RGBA array at (x, y), with
+    the same rounding as PIL's ImageDraw on RGBA images: colour channels
+    blend by the mask (or take the ink outright where the destination is
+    fully transparent), alpha blends by the mask. Zero coverage leaves
+    pixels alone.
+    """
+    h, w = mask.shape
+    H, W = dst.shape[:2]
+    mx0, my0 = max(0, -x), max(0, -y)
+    mx1, my1 = min(w, W - x), min(h, H - y)
+    if mx0 >= mx1 or my0 >= my1:
+        return
+
+    m = mask[my0:my1, mx0:mx1]
+    region = dst[y + my0:y + my1, x + mx0:x + mx1]
+
+    # per-channel blend weight; 16-bit is enough for 255 * 255 + 128
+    weight = np.empty(region.shape, dtype=np.uint16)
+    weight[...] = m[..., None]
+    weight[..., :3] |= (region[..., 3:] == 0) * np.uint16(255)
+
+    out = region * (255 - weight) + np.asarray(ink, dtype=np.uint16) * weight
+    out = _div255(out)
+
+    np.copyto(region, out, casting="unsafe", where=(m != 0)[..., None])
+
+# ==================== WORD TILES ====================
+
+@lru_cache(maxsize=4096)
+def word_tile(text, path, size, ink, under):
+    """
+    A word pre-blended in `ink` over a uniform `under` pixel, as packed
+    32-bit pixels plus its coverage: placing it is one masked copy.
+    """
+    glyphs = word_mask(text, path, size)
+    if glyphs is None:
+        return None
+    mask, ox, oy = glyphs
+
+    tile = np.empty(mask.shape + (4,), dtype=np.uint8)
+    tile[...] = under
+    blend_mask(tile, mask, 0, 0, ink)
+
+    pixels = tile.view(np.uint32)[..., 0]
+    covered = mask != 0
+    pixels.setflags(write=False)
+    covered.setflags(write=False)
+    return pixels, covered, mask, ox, oy
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def draw_words(img, words, path, size, under, safe):
+    """
+    Draw [(text, ink, x, y)] into a contiguous RGBA array, in order.
+    `under` is the uniform pixel inside the `safe` (x0, y0, x1, y1) box;
+    a word wholly inside it that touches no earlier word is a masked
+    copy of its cached tile, anything else goes through blend_mask.
+    """
+    packed = img.view(np.uint32)[..., 0]
+    boxes = []
+
+    for text, ink, x, y in words:
+        tile = word_tile(text, path, size, tuple(ink), tuple(under))
+        if tile is None:
+            continue
+        pixels, covered, mask, ox, oy = tile
+
+        x0, y0 = x + ox, y + oy
+        box = (x0, y0, x0 + mask.shape[1], y0 + mask.shape[0])
+        inside = safe[0] <= box[0] and safe[1] <= box[1] and box[2] <= safe[2] and box[3] <= safe[3]
+
+        if inside and not any(_overlaps(box, b) for b in boxes):
+            np.copyto(packed[box[1]:box[3], box[0]:box[2]], pixels, where=covered)
+        else:
+            blend_mask(img, mask, x0, y0, ink)
+        boxes.append(box)
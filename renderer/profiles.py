@@ -0,0 +1,78 @@
+import os
+
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+# ==================== CONFIG ====================
+
+# draft: quick previews — decoded from the low-res proxy, fewer frames,
+#        fastest x264
+# final: full source resolution and frame rate, default x264 quality
+RENDER_PROFILES = {
+    "draft": {
+        "max_height": 480,
+        "fps": 15,
+        "preset": "ultrafast",
+        "crf": 28,
+        "threads": os.cpu_count() or 1,
+        "proxy": True,
+    },
+    "final": {
+        "max_height": None,
+        "fps": None,
+        "preset": "medium",
+        "crf": None,
+        "threads": None,
+        "proxy": False,
+    },
+}
+
+PROFILE = os.getenv("RENDER_PROFILE", "final")
+
+# ==================== HELPERS ====================
+
+def get_profile(name=PROFILE):
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile: {name}")
+    return dict(RENDER_PROFILES[name], name=name)
+
+def probe(video_path):
+    """
+    (width, height, fps, duration) without opening a frame reader.
+    """
+    infos = ffmpeg_parse_infos(video_path)
+    w, h = infos["video_size"]
+    return w, h, infos["video_fps"], infos["duration"]
+
+def output_size(w, h, profile):
+    """
+    Frame size for a profile; downscaled sizes are kept even for yuv420p.
+    """
+    max_h = profile["max_height"]
+    if not max_h or h <= max_h:
+        return w, h
+    scale = max_h / h
+    return int(w * scale) // 2 * 2, int(max_h) // 2 * 2
+
+def output_fps(fps, profile):
+    return min(fps, profile["fps"]) if profile["fps"] else fps
+
+def write_kwargs(profile, threads=None):
+    """
+    Encoder settings for moviepy's write_videofile.
+    """
+    return {
+        "preset": profile["preset"],
+        "threads": threads or profile["threads"],
+        "ffmpeg_params": ["-crf", str(profile["crf"])] if profile["crf"] else None,
+    }
+
+def x264_args(profile):
+    """
+    The same encoder settings as ffmpeg command-line arguments.
+    """
+    args = ["-c:v", "libx264", "-preset", profile["preset"]]
+    if profile["crf"]:
+        args += ["-crf", str(profile["crf"])]
+    if profile["threads"]:
+        args += ["-threads", str(profile["threads"])]
+    return args
@@ -0,0 +1,59 @@
+import os
+import subprocess
+
+from file_hashes import content_hash
+
+# ==================== CONFIG ====================
+
+PROXY_DIR_NAME = ".proxies"   # created next to the source video
+PROXY_HEIGHT = 480
+
+# ==================== PROXIES ====================
+
+def proxy_path(video_path):
+    """
+    Proxy location for a source: a hidden folder beside it, named after
+    the source's content hash, so rewriting or touching the same upload
+    reuses its proxy and a new upload gets a new one.
+    """
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    digest = content_hash(video_path)[:12]
+    return os.path.join(os.path.dirname(os.path.abspath(video_path)), PROXY_DIR_NAME, f"{stem}_{digest}.mp4")
+
+def ensure_proxy(video_path, height=PROXY_HEIGHT):
+    """
+    Downscaled, all-intra copy of the source for previews. Every frame is
+    a keyframe so chunked renders seek without decoding a GOP. Built once
+    per upload; older proxies of the same source are removed.
+    """
+    path = proxy_path(video_path)
+    if os.path.exists(path):
+        return path
+
+    proxy_dir = os.path.dirname(path)
+    os.makedirs(proxy_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    for name in os.listdir(proxy_dir):
+        if name.rsplit("_", 1)[0] == stem:
+            os.remove(os.path.join(proxy_dir, name))
+
+    command = [
+        "ffmpeg",
+        "-y",
+        "-loglevel", "error",
+        "-i", video_path,
+        "-vf", f"scale=-2:'min({height},ih)'",
+        "-c:v", "libx264",
+        "-preset", "ultrafast",
+        "-tune", "fastdecode",
+        "-g", "1",
+        "-crf", "20",
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        path + ".part.mp4"
+    ]
+    subprocess.run(command, check=True)
+    os.replace(path + ".part.mp4", path)
+
+    print(f"✅ Proxy ready — {os.path.relpath(path)}")
+    return path
@@ -1,12 +1,35 @@
+import argparse
+import hashlib
+import multiprocessing
 import os
+import shutil
+import sys
 import json
-from moviepy.editor import VideoFileClip, CompositeVideoClip, ImageClip
-from PIL import Image, ImageDraw, ImageFont
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from moviepy.editor import VideoClip, VideoFileClip, CompositeVideoClip, ImageClip
+from PIL import Image, ImageDraw
 import numpy as np
 
 # ==================== PATHS ====================
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from renderer.caption_cache import caption_key, load_caption, prune_caption_cache, store_caption
+from renderer.chunks import (
+    CHUNK_CACHE_DIR, chunk_path, concat_chunks, overlays_in_span,
+    plan_spans, prune_chunk_cache, source_id, span_key, split_spans
+)
+from renderer.glyph_atlas import draw_words, load_font, word_mask
+from renderer.profiles import (
+    PROFILE, RENDER_PROFILES, get_profile, output_fps, output_size, probe, write_kwargs
+)
+from renderer.proxy import ensure_proxy
+from visual_decision_engine.intervals import interval_index
 
 VIDEO_PATH = os.path.join(PROJECT_ROOT, "input_video", "raw.mp4")
 CAPTIONS_PATH = os.path.join(PROJECT_ROOT, "caption_engine", "captions.json")
@@ -17,15 +40,27 @@ OUTPUT_PATH = os.path.join(PROJECT_ROOT, "renderer", "output.mp4")
 FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
 FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
 
+CAPTION_FONT_SIZE = 40
+CAPTION_LAYOUT_VERSION = 2       # bump when caption drawing changes (invalidates cached bitmaps)
+BROLL_FONT_SIZE = 30
+
 # ==================== VISUAL CONSTANTS ====================
 
 CAPTION_SLIDE_OFFSET = 12        # subtle upward motion
 BROLL_SLIDE_DISTANCE = 60        # slide-in distance
 CAPTION_SAFE_Y = 0.75            # vertical safe area
 
+CAPTION_SLIDE = 0.2              # seconds of caption slide / fades
+CAPTION_FADE_IN = 0.2
+CAPTION_FADE_OUT = 0.15
+BROLL_SLIDE = 0.3                # seconds of B-roll slide / fades
+BROLL_FADE_IN = 0.2
+BROLL_FADE_OUT = 0.2
+
 COLORS = {
     "text": (255, 255, 255, 255),
     "accent": (255, 200, 0, 255),
+    "highlight": (80, 220, 255, 255),   # karaoke: the word being spoken
     "bg_strong": (0, 0, 0, 180),
     "bg_light": (0, 0, 0, 130),
 }
@@ -33,6 +68,18 @@ COLORS = {
 PADDING = 24
 RADIUS = 18
 
+# Encode the timeline as cached per-span chunks instead of one pass
+INCREMENTAL = os.getenv("RENDER_INCREMENTAL", "1") == "1"
+
+# Encoder processes; the timeline is split across them
+WORKERS = int(os.getenv("RENDER_WORKERS", "1"))
+
+# "moviepy" (Python compositing) or "ffmpeg" (one native filtergraph)
+BACKEND = os.getenv("RENDER_BACKEND", "moviepy")
+
+# "static" captions or "karaoke" (highlight the word being spoken)
+CAPTION_MODE = os.getenv("RENDER_CAPTION_MODE", "static")
+
 # ==================== CONFIG ====================
 
 BROLL_KEYWORDS = {
@@ -53,58 +100,191 @@ def draw_bg(draw, w, h, strong=True):
     color = COLORS["bg_strong"] if strong else COLORS["bg_light"]
     draw.rounded_rectangle((0, 0, w, h), RADIUS, color)
 
-# ==================== CAPTION RENDER ====================
+@lru_cache(maxsize=256)
+def caption_bg(w, h, strong):
+    """
+    draw_bg as a read-only RGBA array, drawn once per size.
+    """
+    img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw_bg(ImageDraw.Draw(img), w, h, strong=strong)
+    arr = np.asarray(img)
+    arr.setflags(write=False)
+    return arr
 
-def render_caption(words, width, decision):
-    font = ImageFont.truetype(FONT_BOLD, 40)
-    tmp = Image.new("RGBA", (10, 10))
-    d = ImageDraw.Draw(tmp)
+# ==================== CAPTION RENDER ====================
 
-    lines, current = [], []
-    for w in words:
+@lru_cache(maxsize=65536)
+def text_length(text, path=FONT_BOLD, size=CAPTION_FONT_SIZE):
+    """
+    Advance width of a word, measured once per process.
+    """
+    return load_font(path, size).getlength(text)
+
+def layout_caption(words, max_width):
+    """
+    Greedy line wrap. Every word is measured once and line widths are
+    running sums of word and space advances, so the cost is linear in
+    the number of words. Lines hold (text, emphasized, index) per word,
+    so emphasis follows the word's own index rather than its spelling.
+    """
+    space = text_length(" ")
+    lines, current, line_w = [], [], 0.0
+    widths = []
+
+    for i, w in enumerate(words):
         t = w.get("word") or w.get("text")
         if not t:
             continue
-        test = " ".join(current + [t])
-        if d.textlength(test, font) < width - 200:
-            current.append(t)
+        tw = text_length(t)
+        test_w = line_w + space + tw if current else tw
+        if test_w < max_width or not current:
+            current.append((t, bool(w.get("emphasized")), i))
+            line_w = test_w
         else:
             lines.append(current)
-            current = [t]
+            widths.append(line_w)
+            current, line_w = [(t, bool(w.get("emphasized")), i)], tw
     if current:
         lines.append(current)
+        widths.append(line_w)
+
+    return lines, widths
+
+def place_caption(words, width, decision):
+    """
+    Bitmap size, background and the top-left pen position of every word
+    as (text, emphasized, x, y, index into words).
+    """
+    lines, widths = layout_caption(words, width - 200)
+    if not lines:
+        lines, widths = [[]], [0.0]
 
     multi_line = len(lines) > 1
-    use_bg = decision.get("title") or decision.get("overlay") or multi_line
+    strong = bool(decision.get("title") or decision.get("overlay"))
 
     line_h = 48
-    text_w = max(int(d.textlength(" ".join(l), font)) for l in lines)
-    img_w = text_w + PADDING * 2
+    img_w = int(max(widths)) + PADDING * 2
     img_h = len(lines) * line_h + PADDING * 2
 
-    img = Image.new("RGBA", (img_w, img_h), (0, 0, 0, 0))
-    d = ImageDraw.Draw(img)
-
-    if use_bg:
-        draw_bg(d, img_w, img_h, strong=decision.get("title") or decision.get("overlay"))
-
+    space = text_length(" ")
+    placed = []
     y = PADDING
-    for ln in lines:
-        x = (img_w - int(d.textlength(" ".join(ln), font))) // 2
-        for word in ln:
-            color = COLORS["accent"] if any(
-                ww.get("emphasized") and ww.get("word") == word for ww in words
-            ) else COLORS["text"]
-            d.text((x, y), word + " ", font=font, fill=color)
-            x += int(font.getlength(word + " "))
+    for ln, line_w in zip(lines, widths):
+        x = (img_w - int(line_w)) // 2
+        for word, emphasized, i in ln:
+            placed.append((word, emphasized, x, y, i))
+            x += int(text_length(word) + space)
         y += line_h
 
+    return {
+        "size": (img_w, img_h),
+        "bg": strong or multi_line,
+        "strong": strong,
+        "words": placed,
+    }
+
+def rasterize_layout(layout, highlight=None):
+    """
+    RGBA array for a placed caption built from the glyph atlas: the
+    cached background plus one cached word tile per word, no PIL
+    drawing. `highlight` draws every word in that colour instead.
+    """
+    img_w, img_h = layout["size"]
+
+    if layout["bg"]:
+        img = caption_bg(img_w, img_h, layout["strong"]).copy()
+        under = COLORS["bg_strong"] if layout["strong"] else COLORS["bg_light"]
+        safe = (RADIUS, RADIUS, img_w - RADIUS, img_h - RADIUS)
+    else:
+        img = np.zeros((img_h, img_w, 4), dtype=np.uint8)
+        under = (0, 0, 0, 0)
+        safe = (0, 0, img_w, img_h)
+
+    draw_words(
+        img,
+        [
+            (word, highlight or (COLORS["accent"] if emphasized else COLORS["text"]), x, y)
+            for word, emphasized, x, y, _ in layout["words"]
+        ],
+        FONT_BOLD, CAPTION_FONT_SIZE, under, safe
+    )
+    return img
+
+def rasterize_caption(words, width, decision):
+    return rasterize_layout(place_caption(words, width, decision))
+
+def render_caption(words, width, decision):
+    return Image.fromarray(rasterize_caption(words, width, decision), "RGBA")
+
+def cached_caption(words, width, decision):
+    """
+    render_caption through the on-disk bitmap cache, so re-renders only
+    rasterize captions whose words, flags or style changed.
+    """
+    style = {"colors": COLORS, "padding": PADDING, "radius": RADIUS, "layout": CAPTION_LAYOUT_VERSION}
+    key = caption_key(words, width, decision, FONT_BOLD, CAPTION_FONT_SIZE, style)
+
+    img = load_caption(key)
+    if img is None:
+        img = render_caption(words, width, decision)
+        store_caption(key, img)
     return img
 
+# ==================== KARAOKE ====================
+
+def karaoke_caption(seg, width, decision):
+    """
+    Everything a karaoke caption needs per frame, computed once: the
+    base bitmap, the same caption with every word highlighted, and for
+    each spoken word its start relative to the segment, its box and its
+    glyph coverage inside that box.
+    """
+    layout = place_caption(seg["words"], width, decision)
+    base = rasterize_layout(layout)
+    lit = rasterize_layout(layout, highlight=COLORS["highlight"])
+
+    words = []
+    for word, _, x, y, i in layout["words"]:
+        glyphs = word_mask(word, FONT_BOLD, CAPTION_FONT_SIZE)
+        if glyphs is None:
+            continue
+        mask, ox, oy = glyphs
+        box = (x + ox, y + oy, x + ox + mask.shape[1], y + oy + mask.shape[0])
+        words.append((seg["words"][i]["start"] - seg["start"], box, mask != 0))
+
+    return base, lit, words
+
+def karaoke_frames(base, lit, words, size=None):
+    """
+    make_frame(t) for a karaoke caption: the base bitmap with the most
+    recently started word copied in from the highlighted one through
+    its glyph coverage. Only a change of word builds a new frame (and
+    resizes it when the overlay was scaled to `size`).
+    """
+    starts = [start for start, _, _ in words]
+    packed_lit = lit.view(np.uint32)[..., 0]
+    rgb = {}
+
+    def make_frame(t):
+        i = bisect_right(starts, t) - 1
+        if i not in rgb:
+            frame = base.copy()
+            if i >= 0:
+                _, (x0, y0, x1, y1), covered = words[i]
+                packed = frame.view(np.uint32)[..., 0]
+                np.copyto(packed[y0:y1, x0:x1], packed_lit[y0:y1, x0:x1], where=covered)
+            if size and size != (frame.shape[1], frame.shape[0]):
+                frame = np.asarray(Image.fromarray(frame, "RGBA").resize(size, Image.Resampling.LANCZOS))
+            rgb.clear()
+            rgb[i] = frame[..., :3]
+        return rgb[i]
+
+    return make_frame
+
 # ==================== B-ROLL ====================
 
 def render_text_broll(text):
-    font = ImageFont.truetype(FONT_BOLD, 30)
+    font = load_font(FONT_BOLD, BROLL_FONT_SIZE)
     tmp = Image.new("RGBA", (10, 10))
     d = ImageDraw.Draw(tmp)
     w = int(d.textlength(text, font))
@@ -115,82 +295,338 @@ def render_text_broll(text):
     d.text((PADDING, 12), text, font=font, fill=COLORS["text"])
     return img
 
-# ==================== MAIN ====================
+# ==================== OVERLAY PLAN ====================
 
-def main():
-    captions = load_json(CAPTIONS_PATH)
-    decisions = load_json(DECISIONS_PATH)
-    decision_map = {d["segment_index"]: d for d in decisions}
-
-    video = VideoFileClip(VIDEO_PATH)
+def image_digest(img):
+    return hashlib.sha1(img.mode.encode() + repr(img.size).encode() + img.tobytes()).hexdigest()
 
-    caption_layer = []
-    broll_layer = []
+def pick_broll(seg, i):
+    label, icon = None, None
+    for w in seg["words"]:
+        t = (w.get("word") or "").lower()
+        for k, (f, txt) in BROLL_KEYWORDS.items():
+            if k in t:
+                label = txt
+                icon = os.path.join(BROLL_ASSET_DIR, f)
+                break
+        if label:
+            break
+
+    if not label and i == 0:
+        label = "AI-Powered Video Editing"
+        icon = os.path.join(BROLL_ASSET_DIR, "ai.png")
+
+    return label, icon
+
+def karaoke_digest(base, lit, words):
+    h = hashlib.sha1(image_digest(base).encode())
+    h.update(lit.tobytes())
+    h.update(repr([(round(start, 4), box) for start, box, _ in words]).encode())
+    return h.hexdigest()
+
+def build_overlays(captions, decisions, video_w, video_h, caption_mode=CAPTION_MODE, scale=1.0):
+    """
+    Data-only description of every caption and B-roll overlay: bitmap,
+    timing and resting position. Clips are built from this per render
+    path, and chunk cache keys hash it. Karaoke captions also carry the
+    base and highlighted bitmaps and per-word timing under "karaoke".
+    Overlays are laid out for the source size and then scaled by `scale`
+    for renders at a reduced resolution.
+    """
+    decision_map = {d["segment_index"]: d for d in decisions}
+    overlays = []
 
     for i, seg in enumerate(captions):
         decision = decision_map.get(i, {})
 
         # -------- CAPTION --------
-        cap_img = render_caption(seg["words"], video.w, decision)
-        base_y = video.h * CAPTION_SAFE_Y
-
-        caption_layer.append(
-            ImageClip(np.array(cap_img))
-            .set_start(seg["start"])
-            .set_end(seg["end"])
-            .set_position(
-                lambda t, by=base_y: ("center", by + CAPTION_SLIDE_OFFSET * (1 - min(t, 0.2) / 0.2))
-            )
-            .fadein(0.2)
-            .fadeout(0.15)
-        )
+        if caption_mode == "karaoke":
+            base, lit, words = karaoke_caption(seg, video_w, decision)
+            cap_img = Image.fromarray(base, "RGBA")
+            karaoke = (base, lit, words)
+            digest = karaoke_digest(cap_img, lit, words)
+        else:
+            cap_img = cached_caption(seg["words"], video_w, decision)
+            karaoke = None
+            digest = image_digest(cap_img)
+
+        overlays.append({
+            "kind": "caption",
+            "image": cap_img,
+            "digest": digest,
+            "start": seg["start"],
+            "end": seg["end"],
+            "x": None,
+            "y": video_h * CAPTION_SAFE_Y,
+            "karaoke": karaoke,
+        })
 
         # -------- B-ROLL --------
-        label, icon = None, None
-        for w in seg["words"]:
-            t = (w.get("word") or "").lower()
-            for k, (f, txt) in BROLL_KEYWORDS.items():
-                if k in t:
-                    label = txt
-                    icon = os.path.join(BROLL_ASSET_DIR, f)
-                    break
-            if label:
-                break
-
-        if not label and i == 0:
-            label = "AI-Powered Video Editing"
-            icon = os.path.join(BROLL_ASSET_DIR, "ai.png")
-
-        start_x = video.w + BROLL_SLIDE_DISTANCE
+        label, icon = pick_broll(seg, i)
 
         if icon and os.path.exists(icon):
             im = Image.open(icon).convert("RGBA")
-            scale = 80 / im.height
-            im = im.resize((int(im.width * scale), 80), Image.Resampling.LANCZOS)
-
-            broll_layer.append(
-                ImageClip(np.array(im))
-                .set_start(seg["start"])
-                .set_end(seg["start"] + 2)
-                .set_position(lambda t: (video.w - im.width - 40 + (1 - min(t, 0.3)/0.3) * BROLL_SLIDE_DISTANCE, 40))
-                .fadein(0.2)
-                .fadeout(0.2)
-            )
+            fit = 80 / im.height
+            im = im.resize((int(im.width * fit), 80), Image.Resampling.LANCZOS)
         elif label:
-            txt = render_text_broll(label)
-            broll_layer.append(
-                ImageClip(np.array(txt))
-                .set_start(seg["start"])
-                .set_end(seg["start"] + 2)
-                .set_position(lambda t: (video.w - txt.width - 40 + (1 - min(t, 0.3)/0.3) * BROLL_SLIDE_DISTANCE, 40))
-                .fadein(0.2)
-                .fadeout(0.2)
+            im = render_text_broll(label)
+        else:
+            continue
+
+        overlays.append({
+            "kind": "broll",
+            "image": im,
+            "digest": image_digest(im),
+            "start": seg["start"],
+            "end": seg["start"] + 2,
+            "x": video_w - im.width - 40,
+            "y": 40,
+        })
+
+    prune_caption_cache()
+    return scale_overlays(overlays, scale) if scale != 1 else overlays
+
+def scale_overlays(overlays, scale):
+    """
+    Overlays for a frame `scale` times the source size: bitmaps resized,
+    positions and slide distances scaled.
+    """
+    scaled = []
+    for ov in overlays:
+        w, h = ov["image"].size
+        im = ov["image"].resize((max(1, round(w * scale)), max(1, round(h * scale))), Image.Resampling.LANCZOS)
+        scaled.append(dict(
+            ov,
+            image=im,
+            digest=hashlib.sha1(f"{ov['digest']}:{im.size}".encode()).hexdigest(),
+            x=None if ov["x"] is None else ov["x"] * scale,
+            y=ov["y"] * scale,
+            scale=scale,
+        ))
+    return scaled
+
+def overlay_clip(ov, offset=0):
+    """
+    moviepy clip for one overlay, shifted `offset` seconds earlier.
+    """
+    if ov.get("karaoke"):
+        alpha = np.array(ov["image"])[..., 3]
+        clip = VideoClip(karaoke_frames(*ov["karaoke"], size=ov["image"].size))\
+            .set_mask(ImageClip(alpha / 255.0, ismask=True))
+    else:
+        clip = ImageClip(np.array(ov["image"]))
+
+    scale = ov.get("scale", 1)
+
+    clip = (
+        clip
+        .set_start(ov["start"] - offset)
+        .set_end(ov["end"] - offset)
+    )
+
+    if ov["kind"] == "caption":
+        return (
+            clip.set_position(
+                lambda t, by=ov["y"], d=CAPTION_SLIDE_OFFSET * scale: (
+                    "center", by + d * (1 - min(t, CAPTION_SLIDE) / CAPTION_SLIDE)
+                )
             )
+            .fadein(CAPTION_FADE_IN)
+            .fadeout(CAPTION_FADE_OUT)
+        )
+
+    return (
+        clip.set_position(
+            lambda t, x=ov["x"], y=ov["y"], d=BROLL_SLIDE_DISTANCE * scale: (x + (1 - min(t, BROLL_SLIDE) / BROLL_SLIDE) * d, y)
+        )
+        .fadein(BROLL_FADE_IN)
+        .fadeout(BROLL_FADE_OUT)
+    )
+
+def layered(overlays):
+    # B-roll sits under captions
+    return [o for o in overlays if o["kind"] != "caption"] + [o for o in overlays if o["kind"] == "caption"]
+
+# ==================== PROFILES ====================
+
+def prepare(captions, decisions, video_path, profile, caption_mode):
+    """
+    Inputs for a render profile: the video to decode (the source, or its
+    low-res proxy for previews), moviepy's target_resolution (None when
+    no further scaling is needed), frame rate, duration, and the
+    overlays laid out for the full-size source and scaled to the output.
+    """
+    w, h, fps, duration = probe(video_path)
+
+    frames_path = ensure_proxy(video_path) if profile["proxy"] else video_path
+    frame_w, frame_h = probe(frames_path)[:2] if frames_path != video_path else (w, h)
+
+    out_w, out_h = output_size(frame_w, frame_h, profile)
+    overlays = build_overlays(captions, decisions, w, h, caption_mode, scale=out_h / h)
+    resolution = None if (out_w, out_h) == (frame_w, frame_h) else (out_h, out_w)
+    return frames_path, resolution, output_fps(fps, profile), duration, overlays
+
+# ==================== CHUNKED RENDER ====================
+
+def encode_span(video_path, span, fps, overlays, out_path, threads=None, profile=None, resolution=None):
+    """
+    Composite and encode frames [span[0], span[1]) as a standalone,
+    video-only chunk that starts on a keyframe. Opens its own reader so
+    it can run in a worker process.
+    """
+    profile = profile or get_profile()
+    video = VideoFileClip(video_path, audio=False, target_resolution=resolution)
+    t0 = span[0] / fps
+    t1 = min(span[1] / fps, video.duration)
+
+    base = video.subclip(t0, t1)
+    clips = [overlay_clip(o, offset=t0) for o in layered(overlays)]
+
+    # moviepy samples np.arange(0, duration, 1/fps); stopping half a frame
+    # early pins the chunk to exactly its frame count
+    frames = span[1] - span[0]
+    CompositeVideoClip([base] + clips)\
+        .set_duration((frames - 0.5) / fps)\
+        .write_videofile(
+            out_path, fps=fps, codec="libx264", audio=False,
+            verbose=False, logger=None, **write_kwargs(profile, threads)
+        )
 
-    CompositeVideoClip([video] + broll_layer + caption_layer)\
-        .write_videofile(OUTPUT_PATH, codec="libx264", audio_codec="aac")
+    video.close()
+    return out_path
+
+def encode_spans(video_path, fps, jobs, workers=1, profile=None, resolution=None):
+    """
+    Encode (span, overlays, out_path) jobs, spread over `workers`
+    processes. x264 threads are split between the workers.
+    """
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        for span, overlays, out_path in jobs:
+            encode_span(video_path, span, fps, overlays, out_path, profile=profile, resolution=resolution)
+        return
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(encode_span, video_path, span, fps, overlays, out_path, threads, profile, resolution)
+            for span, overlays, out_path in jobs
+        ]
+        for f in futures:
+            f.result()
+
+def render_incremental(captions, decisions, video_path=VIDEO_PATH, output_path=OUTPUT_PATH, workers=WORKERS,
+                       caption_mode=CAPTION_MODE, profile=PROFILE):
+    """
+    Encode the timeline as independent chunks cached by content hash;
+    only chunks whose source range or overlays changed are re-encoded.
+    The output is assembled with the concat demuxer without re-encoding.
+    """
+    profile = get_profile(profile)
+    video_path, resolution, fps, duration, overlays = prepare(captions, decisions, video_path, profile, caption_mode)
+
+    os.makedirs(CHUNK_CACHE_DIR, exist_ok=True)
+    source = source_id(video_path)
+    settings = {"codec": "libx264", "profile": profile, "resolution": resolution}
+
+    paths, jobs = [], []
+    index = interval_index(overlays)
+    for span in plan_spans(captions, duration, fps):
+        in_span = overlays_in_span(overlays, span, fps, index)
+        path = chunk_path(span_key(source, span, fps, in_span, settings))
+        paths.append(path)
+
+        if not os.path.exists(path):
+            jobs.append((span, in_span, path + ".part.mp4"))
+
+    encode_spans(video_path, fps, jobs, workers, profile, resolution)
+    for _, _, tmp in jobs:
+        os.replace(tmp, tmp[:-len(".part.mp4")])
+
+    concat_chunks(paths, video_path, output_path)
+    prune_chunk_cache(paths)
+
+    print(f"✅ Incremental render ({profile['name']}) — {len(jobs)}/{len(paths)} chunks re-encoded")
+    return output_path
+
+def render_parallel(captions, decisions, video_path=VIDEO_PATH, output_path=OUTPUT_PATH, workers=WORKERS,
+                    caption_mode=CAPTION_MODE, profile=PROFILE):
+    """
+    Split the timeline into `workers` equal ranges, composite and encode
+    each in its own process and join them losslessly.
+    """
+    profile = get_profile(profile)
+    video_path, resolution, fps, duration, overlays = prepare(captions, decisions, video_path, profile, caption_mode)
+
+    tmp_dir = tempfile.mkdtemp(prefix="render_")
+    try:
+        index = interval_index(overlays)
+        jobs = [
+            (span, overlays_in_span(overlays, span, fps, index), os.path.join(tmp_dir, f"part_{i:03d}.mp4"))
+            for i, span in enumerate(split_spans(int(round(duration * fps)), workers))
+        ]
+        encode_spans(video_path, fps, jobs, workers, profile, resolution)
+        concat_chunks([out for _, _, out in jobs], video_path, output_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"✅ Parallel render ({profile['name']}) — {len(jobs)} ranges on {workers} workers")
+    return output_path
+
+# ==================== MAIN ====================
+
+def render_native(captions, decisions, video_path=VIDEO_PATH, output_path=OUTPUT_PATH, profile=PROFILE):
+    """
+    ffmpeg backend: overlays are composited by one filter_complex instead
+    of moviepy's per-frame Python blits.
+    """
+    from renderer.ffmpeg_backend import render_overlays_ffmpeg
+
+    profile = get_profile(profile)
+    video_path, resolution, fps, _, overlays = prepare(captions, decisions, video_path, profile, "static")
+    render_overlays_ffmpeg(video_path, layered(overlays), fps, output_path, profile, resolution)
+
+    print(f"✅ ffmpeg render ({profile['name']}) — {len(overlays)} overlays composited natively")
+    return output_path
+
+def render(captions, decisions, video_path=VIDEO_PATH, output_path=OUTPUT_PATH,
+           incremental=INCREMENTAL, workers=WORKERS, backend=BACKEND, caption_mode=CAPTION_MODE,
+           profile=PROFILE):
+    if backend == "ffmpeg" and caption_mode == "karaoke":
+        print("ℹ️ Karaoke captions need per-frame highlights — using the moviepy backend")
+        backend = "moviepy"
+
+    if backend == "ffmpeg":
+        return render_native(captions, decisions, video_path, output_path, profile)
+    if incremental:
+        return render_incremental(captions, decisions, video_path, output_path, workers, caption_mode, profile)
+    if workers > 1:
+        return render_parallel(captions, decisions, video_path, output_path, workers, caption_mode, profile)
+
+    profile = get_profile(profile)
+    video_path, resolution, fps, _, overlays = prepare(captions, decisions, video_path, profile, caption_mode)
+    video = VideoFileClip(video_path, target_resolution=resolution)
+
+    CompositeVideoClip([video] + [overlay_clip(o) for o in layered(overlays)])\
+        .write_videofile(output_path, fps=fps, codec="libx264", audio_codec="aac", **write_kwargs(profile))
 
     print("✅ Odysser-style captions + animated B-roll rendered")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Render captions and B-roll onto the input video")
+    parser.add_argument("--full", action="store_true", help="full-timeline encode, no chunk cache")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="encoder processes")
+    parser.add_argument("--backend", choices=["moviepy", "ffmpeg"], default=BACKEND, help="compositing backend")
+    parser.add_argument("--captions", choices=["static", "karaoke"], default=CAPTION_MODE, help="caption mode")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES), default=PROFILE, help="render profile")
+    args = parser.parse_args()
+
+    render(
+        load_json(CAPTIONS_PATH), load_json(DECISIONS_PATH),
+        incremental=not args.full, workers=args.workers, backend=args.backend,
+        caption_mode=args.captions, profile=args.profile
+    )
 
 if __name__ == "__main__":
     main()
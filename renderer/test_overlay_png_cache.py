@@ -0,0 +1,41 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from renderer import ffmpeg_backend
+from renderer.ffmpeg_backend import prune_overlay_pngs
+
+# -----------------------------
+# TESTS
+# -----------------------------
+
+def write_pngs(directory, names):
+    paths = []
+    for age, name in enumerate(names):
+        path = directory / f"{name}.png"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + age, 1000 + age))
+        paths.append(str(path))
+    return paths
+
+def test_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(ffmpeg_backend, "OVERLAY_PNG_DIR", str(tmp_path))
+    oldest, middle, newest = write_pngs(tmp_path, ["a", "b", "c"])
+
+    prune_overlay_pngs([], max_bytes=200)
+
+    assert not os.path.exists(oldest)
+    assert os.path.exists(middle) and os.path.exists(newest)
+
+def test_current_render_is_never_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(ffmpeg_backend, "OVERLAY_PNG_DIR", str(tmp_path))
+    oldest, middle, newest = write_pngs(tmp_path, ["a", "b", "c"])
+
+    prune_overlay_pngs([oldest], max_bytes=100)
+
+    assert os.path.exists(oldest)
+    assert not os.path.exists(middle) and not os.path.exists(newest)
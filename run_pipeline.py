@@ -1,28 +1,388 @@
-import subprocess
-import sys
+import argparse
+import hashlib
+import json
 import os
+import shutil
+import sys
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-def run_step(name, command):
-    print(f"\n🚀 Running: {name}")
-    result = subprocess.run(command, shell=True, cwd=PROJECT_ROOT)
-    if result.returncode != 0:
-        print(f"❌ Failed at step: {name}")
-        sys.exit(1)
-    print(f"✅ Completed: {name}")
+from file_hashes import hash_file, load_hash_index, save_hash_index
+
+STATE_PATH = os.path.join(PROJECT_ROOT, "nlp_command_parser", "editor_state.json")
+CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "pipeline")
+
+# Cached results kept per stage (older ones are pruned)
+CACHE_ENTRIES_PER_STAGE = 4
+
+# -----------------------------
+# ARTIFACTS
+# -----------------------------
+# Everything a stage produces is also written to its usual location so the
+# frontend, translation and highlight scripts keep reading the same files.
+
+INPUT_VIDEO = os.path.join(PROJECT_ROOT, "input_video", "raw.mp4")
+
+ARTIFACT_PATHS = {
+    "audio": os.path.join(PROJECT_ROOT, "audio_processing", "audio.wav"),
+    "transcript": os.path.join(PROJECT_ROOT, "transcription", "transcript.json"),
+    "segments": os.path.join(PROJECT_ROOT, "segmentation", "segments.json"),
+    "captions": os.path.join(PROJECT_ROOT, "caption_engine", "captions.json"),
+    "decisions": os.path.join(PROJECT_ROOT, "visual_decision_engine", "visual_decisions.json"),
+    "output": os.path.join(PROJECT_ROOT, "renderer", "output.mp4"),
+}
+
+# -----------------------------
+# STAGES
+# -----------------------------
+# Stage modules are imported on first use so a fully cached run never
+# loads torch/whisper or moviepy.
+
+def run_extract_audio(inputs, state, out_path):
+    from audio_processing.extract_audio import extract_audio
+    return extract_audio(inputs["video"], out_path)
+
+def run_transcribe(inputs, state, out_path):
+    # Prefer the warm model of a running whisper_server; the request
+    # carries TRANSCRIBE_WORKERS / TRANSCRIBE_VAD so both paths agree
+    from transcription.whisper_server import request_transcript
+    transcript = request_transcript(inputs["audio"])
+    if transcript is not None:
+        print("✅ Transcription complete (whisper server)")
+        return transcript
+
+    from transcription.transcribe import transcribe
+    return transcribe(inputs["audio"], output_json=None)
+
+def run_transcribe_stream(inputs, state, out_path):
+    from transcription.transcribe import transcribe_video
+    return transcribe_video(inputs["video"], output_json=None)
+
+def run_segmenter(inputs, state, out_path):
+    from segmentation.segmenter import (
+        detect_segments, diff_segments, load_previous_segments, save_change_set, segmentation_params
+    )
+    previous = load_previous_segments(out_path)
+    segments = detect_segments(inputs["transcript"], **segmentation_params(state))
+    save_change_set(diff_segments(previous, segments))
+    return segments
+
+def run_captions(inputs, state, out_path):
+    from caption_engine.captions import build_captions, clear_old_translations
+    clear_old_translations()
+    return build_captions(inputs["segments"])
+
+def run_decisions(inputs, state, out_path):
+    from visual_decision_engine.decision_engine import build_decisions
+    return build_decisions(inputs["segments"], inputs["captions"])
+
+def run_render(inputs, state, out_path):
+    from renderer.render import CAPTION_MODE, PROFILE, render
+    # editor_state wins; otherwise the RENDER_* environment defaults apply
+    mode = state.get("caption_style", {}).get("mode", CAPTION_MODE)
+    profile = state.get("render", {}).get("profile", PROFILE)
+    return render(
+        inputs["captions"], inputs["decisions"], inputs["video"], out_path,
+        caption_mode=mode, profile=profile
+    )
+
+# Every stage declares the artifacts it reads, the artifact it writes, the
+# editor_state.json sections that influence its output, the helper modules
+# it runs besides its entry script (deps) and the environment variables it
+# reads (env). A stage is skipped when the hash of all of these is cached.
+
+STAGES = [
+    {
+        "name": "Audio Extraction",
+        "source": "audio_processing/extract_audio.py",
+        "run": run_extract_audio,
+        "inputs": ["video"],
+        "output": "audio",
+        "state_keys": [],
+        "deps": [],
+        "env": [],
+    },
+    {
+        "name": "Transcription",
+        "source": "transcription/transcribe.py",
+        "run": run_transcribe,
+        "inputs": ["audio"],
+        "output": "transcript",
+        "state_keys": [],
+        "deps": [
+            "transcription/chunking.py",
+            "transcription/whisper_server.py",
+            "audio_processing/vad.py",
+        ],
+        "env": ["TRANSCRIBE_WORKERS", "TRANSCRIBE_VAD"],
+    },
+    {
+        "name": "Segmentation",
+        "source": "segmentation/segmenter.py",
+        "run": run_segmenter,
+        "inputs": ["transcript"],
+        "output": "segments",
+        "state_keys": ["segmentation"],
+        "deps": [],
+        "env": [],
+    },
+    {
+        "name": "Caption Engine",
+        "source": "caption_engine/captions.py",
+        "run": run_captions,
+        "inputs": ["segments"],
+        "output": "captions",
+        "state_keys": [],
+        "deps": [],
+        "env": [],
+    },
+    {
+        "name": "Visual Decisions",
+        "source": "visual_decision_engine/decision_engine.py",
+        "run": run_decisions,
+        "inputs": ["segments", "captions"],
+        "output": "decisions",
+        "state_keys": ["emphasis", "overlays"],
+        "deps": [
+            "visual_decision_engine/intervals.py",
+            "visual_decision_engine/topic_embeddings.py",
+            "visual_decision_engine/topic_index.py",
+        ],
+        "env": [],
+    },
+    {
+        "name": "Rendering",
+        "source": "renderer/render.py",
+        "run": run_render,
+        "inputs": ["video", "captions", "decisions"],
+        "output": "output",
+        "state_keys": ["caption_style", "broll", "animations", "overlays", "render"],
+        "deps": [
+            "renderer/caption_cache.py",
+            "renderer/chunks.py",
+            "renderer/ffmpeg_backend.py",
+            "renderer/glyph_atlas.py",
+            "renderer/profiles.py",
+            "renderer/proxy.py",
+            "visual_decision_engine/intervals.py",
+        ],
+        "env": ["RENDER_BACKEND", "RENDER_INCREMENTAL", "RENDER_CAPTION_MODE", "RENDER_PROFILE"],
+    },
+]
+
+# Streaming variant: ffmpeg decodes straight into Whisper, so there is no
+# audio.wav to write, cache or read back.
+
+STREAMING_STAGES = [
+    {
+        "name": "Transcription (streamed)",
+        "source": "transcription/transcribe.py",
+        "run": run_transcribe_stream,
+        "inputs": ["video"],
+        "output": "transcript",
+        "state_keys": [],
+        "deps": ["transcription/chunking.py", "audio_processing/extract_audio.py"],
+        "env": ["TRANSCRIBE_WORKERS"],
+    },
+] + STAGES[2:]
+
+# -----------------------------
+# HASHING
+# -----------------------------
+
+def load_state():
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def stage_key(stage, paths, state, index):
+    """
+    Content key for a stage: its source and helper modules, its input
+    artifacts, the editor_state sections and the environment variables
+    it depends on. None if an input is missing.
+    """
+    parts = {
+        "stage": stage["name"],
+        "source": hash_file(os.path.join(PROJECT_ROOT, stage["source"]), index),
+        "deps": {d: hash_file(os.path.join(PROJECT_ROOT, d), index) for d in stage["deps"]},
+        "env": {k: os.getenv(k) for k in stage["env"]},
+        "inputs": {},
+        "state": {k: state.get(k) for k in stage["state_keys"]},
+    }
+
+    for name in stage["inputs"]:
+        digest = hash_file(paths[name], index)
+        if digest is None:
+            return None
+        parts["inputs"][name] = digest
+
+    blob = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+# -----------------------------
+# CACHE
+# -----------------------------
+
+def stage_cache_dir(stage):
+    slug = os.path.splitext(os.path.basename(stage["source"]))[0]
+    return os.path.join(CACHE_DIR, slug)
+
+def restore_from_cache(stage, key, target, index):
+    entry_dir = os.path.join(stage_cache_dir(stage), key)
+    meta_path = os.path.join(entry_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return False
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    cached = os.path.join(entry_dir, meta["file"])
+    if not os.path.exists(cached):
+        return False
+
+    if hash_file(target, index) != meta["sha256"]:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(cached, target)
+        hash_file(target, index)
+
+    # touch so pruning keeps recently used entries
+    os.utime(meta_path)
+    return True
+
+def store_in_cache(stage, key, source, index):
+    digest = hash_file(source, index)
+    if digest is None:
+        return
+
+    entry_dir = os.path.join(stage_cache_dir(stage), key)
+    os.makedirs(entry_dir, exist_ok=True)
+
+    name = os.path.basename(source)
+    shutil.copy2(source, os.path.join(entry_dir, name))
+
+    with open(os.path.join(entry_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"stage": stage["name"], "key": key, "file": name, "sha256": digest}, f, indent=2)
+
+    prune_cache(stage)
+
+def prune_cache(stage):
+    root = stage_cache_dir(stage)
+    entries = []
+    for name in os.listdir(root):
+        meta_path = os.path.join(root, name, "meta.json")
+        if os.path.exists(meta_path):
+            entries.append((os.path.getmtime(meta_path), name))
+
+    entries.sort(reverse=True)
+    for _, name in entries[CACHE_ENTRIES_PER_STAGE:]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+# -----------------------------
+# PIPELINE
+# -----------------------------
+
+def save_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+class Pipeline:
+    """
+    Runs every stage inside this interpreter. Results are handed to the
+    next stage in memory; JSON files are only written for other tools and
+    only read back when an upstream stage was a cache hit.
+    """
+
+    def __init__(self, stages=STAGES, force=False):
+        self.stages = stages
+        self.force = force
+        self.cache_hits = []
+
+    def run(self, video_path=INPUT_VIDEO, state=None):
+        state = load_state() if state is None else state
+        paths = dict(ARTIFACT_PATHS, video=os.path.abspath(video_path))
+        values = {"video": paths["video"]}
+        index = load_hash_index()
+        self.cache_hits = []
+
+        try:
+            for stage in self.stages:
+                self._run_stage(stage, paths, values, state, index)
+        finally:
+            save_hash_index(index)
+
+        return self._value("output", paths, values)
+
+    def _run_stage(self, stage, paths, values, state, index):
+        name = stage["name"]
+        out_path = paths[stage["output"]]
+
+        key = None if self.force else stage_key(stage, paths, state, index)
+        if key and restore_from_cache(stage, key, out_path, index):
+            print(f"\n♻️ Cached: {name}")
+            self.cache_hits.append(name)
+            values.pop(stage["output"], None)
+            return
+
+        print(f"\n🚀 Running: {name}")
+        inputs = {n: self._value(n, paths, values) for n in stage["inputs"]}
+
+        try:
+            result = stage["run"](inputs, state, out_path)
+        except Exception:
+            print(f"❌ Failed at step: {name}")
+            raise
+
+        if out_path.endswith(".json"):
+            save_json(out_path, result)
+        values[stage["output"]] = result
+        print(f"✅ Completed: {name}")
+
+        key = stage_key(stage, paths, state, index)
+        if key:
+            store_in_cache(stage, key, out_path, index)
+
+    def _value(self, name, paths, values):
+        # Outputs of cached stages are loaded lazily, only if someone needs them
+        if name not in values:
+            path = paths[name]
+            if path.endswith(".json"):
+                with open(path, "r", encoding="utf-8") as f:
+                    values[name] = json.load(f)
+            else:
+                values[name] = path
+        return values[name]
+
+# -----------------------------
+# CLI
+# -----------------------------
 
 def main():
-    print("\n🎬 AUTOMATED VIDEO EDITING PIPELINE STARTED")
+    parser = argparse.ArgumentParser(description="Run the automated editing pipeline")
+    parser.add_argument("--video", default=INPUT_VIDEO, help="source video")
+    parser.add_argument("--force", action="store_true", help="ignore cached stage outputs")
+    parser.add_argument("--stream", action="store_true", help="stream audio into Whisper without audio.wav")
+    parser.add_argument("--profile", choices=["draft", "final"], help="render profile (overrides editor state)")
+    args = parser.parse_args()
 
-    run_step("Audio Extraction", "python audio_processing/extract_audio.py")
-    run_step("Transcription", "python transcription/transcribe.py")
-    run_step("Segmentation", "python segmentation/segmenter.py")
-    run_step("Caption Engine", "python caption_engine/captions.py")
+    state = load_state()
+    if args.profile:
+        state.setdefault("render", {})["profile"] = args.profile
 
-    run_step("Visual Decisions", "python visual_decision_engine/decision_engine.py")
-    run_step("Rendering", "python renderer/render.py")
+    print("\n🎬 AUTOMATED VIDEO EDITING PIPELINE STARTED")
+
+    stages = STREAMING_STAGES if args.stream else STAGES
+    pipeline = Pipeline(stages=stages, force=args.force)
+    try:
+        pipeline.run(args.video, state)
+    except Exception as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
+    hits = pipeline.cache_hits
+    print(f"\n♻️ Cache hits: {len(hits)}/{len(pipeline.stages)}" + (f" ({', '.join(hits)})" if hits else ""))
     print("\n🏁 Pipeline finished successfully")
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+import copy
+import json
+import os
+import random
+import sys
+from statistics import mean
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from segmentation.segmenter import (
+    MAX_SEGMENT_DURATION, PAUSE_THRESHOLD, STRONG_KEYWORDS, detect_segments, diff_segments, mean_duration
+)
+
+# -----------------------------
+# REFERENCE
+# -----------------------------
+# Frozen copy of the original per-word loop (baseline segmenter.py);
+# the vectorized detect_segments must reproduce it exactly.
+
+def reference_segments(words):
+    segments = []
+    current_segment = []
+    segment_start_time = words[0]["start"]
+
+    durations = [(w["end"] - w["start"]) for w in words]
+    avg_duration = mean(durations)
+
+    for i, word in enumerate(words):
+        emphasized = False
+        duration = word["end"] - word["start"]
+
+        if duration > 1.3 * avg_duration:
+            emphasized = True
+        if word["word"].isupper():
+            emphasized = True
+        if word["word"].lower() in STRONG_KEYWORDS:
+            emphasized = True
+
+        word["emphasized"] = emphasized
+        current_segment.append(word)
+
+        if i < len(words) - 1:
+            pause = words[i + 1]["start"] - word["end"]
+            segment_duration = word["end"] - segment_start_time
+
+            if (
+                pause >= PAUSE_THRESHOLD or
+                word["word"].endswith((".", "?", "!")) or
+                segment_duration >= MAX_SEGMENT_DURATION
+            ):
+                segments.append({
+                    "start": segment_start_time,
+                    "end": word["end"],
+                    "words": current_segment
+                })
+                current_segment = []
+                segment_start_time = words[i + 1]["start"]
+
+    if current_segment:
+        segments.append({
+            "start": segment_start_time,
+            "end": current_segment[-1]["end"],
+            "words": current_segment
+        })
+
+    return segments
+
+# -----------------------------
+# FIXTURES
+# -----------------------------
+
+VOCAB = ["so", "the", "main", "idea", "is", "KEY", "Note", "okay.", "right?", "wow!", "AI", "remember", "um"]
+
+def random_transcript(seed, n, overlapping=False):
+    """
+    Whisper-like words: rounded timings, mostly short gaps with some long
+    pauses, and (optionally) overlapping speakers with out-of-order ends.
+    """
+    rng = random.Random(seed)
+    t = rng.uniform(0, 2)
+    words = []
+    for _ in range(n):
+        length = round(rng.choice([0.1, 0.2, 0.3, rng.uniform(0.05, 1.5)]), 3)
+        start = round(t, 3)
+        end = round(start + length, 3)
+        words.append({"word": rng.choice(VOCAB), "start": start, "end": end})
+
+        gap = rng.choice([0.0, 0.05, 0.1, 0.7, rng.uniform(0, 2)])
+        t = end + gap
+        if overlapping and rng.random() < 0.2:
+            t = start + rng.uniform(0, length)
+    return words
+
+def assert_same(words):
+    expected = reference_segments(copy.deepcopy(words))
+    actual = detect_segments(copy.deepcopy(words))
+    assert actual == expected
+
+# -----------------------------
+# TESTS
+# -----------------------------
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_on_random_transcripts(seed):
+    assert_same(random_transcript(seed, n=random.Random(seed).randint(1, 3000)))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_reference_with_overlapping_speakers(seed):
+    assert_same(random_transcript(seed, n=2000, overlapping=True))
+
+def test_matches_reference_on_long_monologue():
+    # no pauses or punctuation: every cut comes from the duration cap
+    words = [
+        {"word": "um", "start": round(i * 0.3, 3), "end": round(i * 0.3 + 0.3, 3)}
+        for i in range(5000)
+    ]
+    assert_same(words)
+
+def test_matches_reference_with_one_overlap_in_a_long_monologue():
+    # a single out-of-order end must not send the whole transcript down
+    # the slow path, nor change any cut
+    words = [
+        {"word": "um", "start": round(i * 0.3, 3), "end": round(i * 0.3 + 0.25, 3)}
+        for i in range(100000)
+    ]
+    words[10]["end"] = words[12]["end"] + 0.5
+    assert_same(words)
+
+def test_matches_reference_on_large_overlapping_transcript():
+    assert_same(random_transcript(99, n=100000, overlapping=True))
+
+def test_single_word():
+    assert_same([{"word": "Hello.", "start": 0.0, "end": 0.4}])
+
+def test_matches_reference_on_checked_in_transcript():
+    path = os.path.join(PROJECT_ROOT, "transcription", "transcript.json")
+    if not os.path.exists(path):
+        pytest.skip("no transcript.json")
+    with open(path, "r", encoding="utf-8") as f:
+        assert_same(json.load(f))
+
+def test_mean_duration_is_correctly_rounded():
+    import numpy as np
+    rng = random.Random(0)
+    for _ in range(200):
+        values = [round(rng.uniform(0, 2), 3) - round(rng.uniform(0, 2), 3) for _ in range(rng.randint(1, 500))]
+        assert mean_duration(np.array(values)) == mean(values)
+
+# -----------------------------
+# CHANGE SETS
+# -----------------------------
+
+def test_diff_of_identical_runs_is_all_unchanged():
+    words = random_transcript(1, n=500)
+    previous = detect_segments(copy.deepcopy(words))
+    segments = detect_segments(copy.deepcopy(words))
+
+    changes = diff_segments(previous, segments)
+    assert changes["added"] == [] and changes["removed"] == []
+    assert changes["unchanged"] == [[i, i] for i in range(len(segments))]
+
+def test_duplicate_segments_pair_up_in_order():
+    seg = {"start": 0.0, "end": 0.4, "words": [{"word": "um", "start": 0.0, "end": 0.4, "emphasized": False}]}
+    other = {"start": 1.0, "end": 1.4, "words": [{"word": "so", "start": 1.0, "end": 1.4, "emphasized": False}]}
+
+    changes = diff_segments([seg, other, seg], [seg, seg, seg])
+    assert changes["unchanged"] == [[0, 0], [2, 1]]
+    assert changes["added"] == [2]
+    assert changes["removed"] == [1]
+
+def test_threshold_change_only_touches_affected_segments():
+    words = random_transcript(2, n=2000)
+    previous = detect_segments(copy.deepcopy(words))
+    segments = detect_segments(copy.deepcopy(words), max_segment_duration=MAX_SEGMENT_DURATION - 2)
+
+    changes = diff_segments(previous, segments)
+    kept_old = [i for i, _ in changes["unchanged"]]
+    kept_new = [j for _, j in changes["unchanged"]]
+
+    # every segment is accounted for exactly once on each side
+    assert sorted(kept_old + changes["removed"]) == list(range(len(previous)))
+    assert sorted(kept_new + changes["added"]) == list(range(len(segments)))
+    # a shorter cap splits some segments but leaves most of them alone
+    assert changes["added"] and changes["removed"]
+    assert len(changes["unchanged"]) > len(changes["added"])
+    for i, j in changes["unchanged"]:
+        assert previous[i] == segments[j]
+
+def test_zero_pause_threshold_keeps_only_single_word_segments():
+    words = random_transcript(3, n=1000)
+    previous = detect_segments(copy.deepcopy(words))
+    segments = detect_segments(copy.deepcopy(words), pause_threshold=0.0)
+
+    changes = diff_segments(previous, segments)
+    assert len(segments) == len(words)
+    assert all(len(previous[i]["words"]) == 1 for i, _ in changes["unchanged"])
+    assert len(changes["unchanged"]) + len(changes["removed"]) == len(previous)
+    assert len(changes["unchanged"]) + len(changes["added"]) == len(segments)
@@ -0,0 +1,43 @@
+import hashlib
+import json
+import os
+
+from file_hashes import content_hash, hash_file, load_hash_index, save_hash_index
+
+# -----------------------------
+# TESTS
+# -----------------------------
+
+def test_unreadable_index_is_empty(tmp_path):
+    index_path = tmp_path / "file_hashes.json"
+    index_path.write_text('{"/video.mp4": {"size": 1')
+    assert load_hash_index(str(index_path)) == {}
+
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frames")
+    assert content_hash(str(video), str(index_path)) == hashlib.sha256(b"frames").hexdigest()
+    assert str(video) in json.loads(index_path.read_text())
+
+def test_save_keeps_entries_written_since_load(tmp_path):
+    index_path = str(tmp_path / "file_hashes.json")
+    a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+    a.write_bytes(b"a")
+    b.write_bytes(b"b")
+
+    index = load_hash_index(index_path)   # a pipeline run starts
+    hash_file(str(a), index)
+    content_hash(str(b), index_path)      # the renderer hashes mid-run
+    save_hash_index(index, index_path)    # the run finishes
+
+    saved = load_hash_index(index_path)
+    assert set(saved) == {str(a), str(b)}
+    assert not os.path.exists(index_path + ".part")
+
+def test_changed_file_is_hashed_again(tmp_path):
+    index_path = str(tmp_path / "file_hashes.json")
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"one")
+    first = content_hash(str(video), index_path)
+
+    video.write_bytes(b"two!")
+    assert content_hash(str(video), index_path) != first
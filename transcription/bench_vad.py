@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import whisper
+
+from audio_processing.vad import detect_speech_regions, vad_report
+from transcription.chunking import pack_regions
+from transcription.transcribe import AUDIO_PATH, load_model, transcribe_regions, transcribe_words
+
+# -----------------------------
+# BENCHMARK
+# -----------------------------
+# Whole-file Whisper vs the VAD pre-pass (packed regions) on one audio
+# file, same model, warm. Usage: python transcription/bench_vad.py [audio.wav]
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VAD pre-pass against whole-file ASR")
+    parser.add_argument("audio", nargs="?", default=AUDIO_PATH)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode (best is reported)")
+    args = parser.parse_args()
+
+    audio = whisper.load_audio(args.audio)
+    load_model()   # warm-up is not part of either timing
+
+    regions, vad_seconds = timed(detect_speech_regions, audio)
+    report = vad_report(audio, regions)
+    calls = len(pack_regions(regions))
+
+    whole = min(timed(transcribe_words, audio)[1] for _ in range(args.repeat))
+    vad = min(timed(transcribe_regions, audio, regions, 1)[1] for _ in range(args.repeat))
+
+    print(f"ℹ️ {report['total_seconds']}s audio, {report['regions']} speech regions "
+          f"({report['skipped_ratio']:.0%} skipped), {calls} Whisper calls after packing")
+    print(f"⏱️ whole file: {whole:.2f}s")
+    print(f"⏱️ VAD:        {vad + vad_seconds:.2f}s (detection {vad_seconds * 1000:.0f} ms)")
+    print(f"🚀 speedup:    {whole / (vad + vad_seconds):.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+from bisect import bisect_right
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+CHUNK_SECONDS = 30        # Whisper's native window
+OVERLAP_SECONDS = 2       # shared audio between neighbouring chunks
+SNAP_SECONDS = 3          # how far back a cut may move to find silence
+FRAME_SECONDS = 0.02      # energy frame used for silence search
+PACK_GAP_SECONDS = 0.3    # silence between speech regions packed into one chunk
+
+# -----------------------------
+# CHUNK PLANNING
+# -----------------------------
+
+def frame_energy(audio):
+    """
+    RMS energy per FRAME_SECONDS frame of a mono float32 signal.
+    """
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    n = len(audio) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n * frame].reshape(n, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+def next_cut(audio, start, chunk_seconds=CHUNK_SECONDS, overlap_seconds=OVERLAP_SECONDS,
+             snap_seconds=SNAP_SECONDS):
+    """
+    End sample of the chunk starting at `start`: chunk_seconds later,
+    moved back to the quietest frame within snap_seconds so chunks tend
+    to end in a pause. Only reads audio up to the returned cut, so it
+    works on a buffer that is still being filled.
+    """
+    end = start + int(chunk_seconds * SAMPLE_RATE)
+    if end >= len(audio):
+        return len(audio)
+
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    lo = max(start + int(overlap_seconds * SAMPLE_RATE) * 2, end - int(snap_seconds * SAMPLE_RATE))
+    lo -= (lo - start) % frame
+
+    energy = frame_energy(audio[lo:end])
+    if len(energy) == 0:
+        return end
+    return lo + int(np.argmin(energy)) * frame
+
+def plan_chunks(audio, chunk_seconds=CHUNK_SECONDS, overlap_seconds=OVERLAP_SECONDS,
+                snap_seconds=SNAP_SECONDS):
+    """
+    Split audio into (start, end) sample ranges of at most chunk_seconds.
+    Neighbours overlap by overlap_seconds so words at a cut appear whole
+    in one of them.
+    """
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    bounds = []
+    start = 0
+
+    while True:
+        end = next_cut(audio, start, chunk_seconds, overlap_seconds, snap_seconds)
+        bounds.append((start, end))
+        if end >= len(audio):
+            return bounds
+        start = end - overlap
+
+# -----------------------------
+# REGION PACKING
+# -----------------------------
+# Whisper pads every call to a 30 s window, so many short VAD regions are
+# packed into one call each and the words mapped back afterwards.
+
+def pack_regions(regions, chunk_seconds=CHUNK_SECONDS, gap_seconds=PACK_GAP_SECONDS):
+    """
+    Group consecutive (start, end) second ranges so each group, joined
+    with gap_seconds of silence, fits in one chunk. A region longer than
+    a chunk is a group of its own (and is chunked normally).
+    """
+    packs, current, length = [], [], 0.0
+    for start, end in regions:
+        size = end - start
+        needed = size + (gap_seconds if current else 0.0)
+        if current and length + needed > chunk_seconds:
+            packs.append(current)
+            current, length = [], 0.0
+            needed = size
+        current.append((start, end))
+        length += needed
+    if current:
+        packs.append(current)
+    return packs
+
+def pack_audio(audio, regions, gap_seconds=PACK_GAP_SECONDS):
+    """
+    The regions of a signal joined by short silences, plus the timestamp
+    map: (packed_start, original_start, original_end) seconds per region.
+    """
+    gap = np.zeros(int(gap_seconds * SAMPLE_RATE), dtype=np.float32)
+    parts, pieces, pos = [], [], 0
+    for start, end in regions:
+        if parts:
+            parts.append(gap)
+            pos += len(gap)
+        part = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+        pieces.append((pos / SAMPLE_RATE, start, start + len(part) / SAMPLE_RATE))
+        parts.append(part)
+        pos += len(part)
+    signal = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    return signal, pieces
+
+def unpack_words(words, pieces):
+    """
+    Move words from a packed chunk's timeline onto the original one.
+    A word belongs to the region its start falls in (or the one before
+    the gap it starts in) and is clamped to that region.
+    """
+    starts = [p[0] for p in pieces]
+    out = []
+    for w in words:
+        i = max(0, bisect_right(starts, w["start"]) - 1)
+        packed_start, orig_start, orig_end = pieces[i]
+        start = min(w["start"] - packed_start + orig_start, orig_end)
+        end = min(max(w["end"] - packed_start + orig_start, start), orig_end)
+        out.append(dict(w, start=round(start, 3), end=round(end, 3)))
+    return out
+
+# -----------------------------
+# STITCHING
+# -----------------------------
+
+def _norm(word):
+    return word.strip(" .,?!;:\"'").lower()
+
+def stitch_words(chunk_words, bounds):
+    """
+    Merge per-chunk word lists (already on the global timeline).
+    Words in an overlap are kept from whichever chunk owns that side of
+    the overlap midpoint; a word repeated across the cut is dropped and
+    timestamps are clamped to stay monotonic.
+    """
+    cuts = [
+        (bounds[i + 1][0] + bounds[i][1]) / 2 / SAMPLE_RATE
+        for i in range(len(bounds) - 1)
+    ]
+
+    merged = []
+    for i, words in enumerate(chunk_words):
+        lo = cuts[i - 1] if i > 0 else float("-inf")
+        hi = cuts[i] if i < len(cuts) else float("inf")
+
+        for w in words:
+            center = (w["start"] + w["end"]) / 2
+            if not lo <= center < hi:
+                continue
+
+            if merged:
+                prev = merged[-1]
+                if _norm(prev["word"]) == _norm(w["word"]) and w["start"] < prev["end"]:
+                    continue
+                start = max(w["start"], prev["end"])
+            else:
+                start = w["start"]
+
+            merged.append({
+                "word": w["word"],
+                "start": round(start, 3),
+                "end": round(max(w["end"], start), 3)
+            })
+
+    return merged
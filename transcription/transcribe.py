@@ -1,17 +1,57 @@
+import argparse
 import os
-import whisper
+import sys
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import torch
+import whisper
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from transcription.chunking import (
+    CHUNK_SECONDS, OVERLAP_SECONDS, SAMPLE_RATE, next_cut, pack_audio, pack_regions,
+    plan_chunks, stitch_words, unpack_words
+)
 
 AUDIO_PATH = os.path.join(BASE_DIR, "../audio_processing/audio.wav")
 OUTPUT_JSON = os.path.join(BASE_DIR, "transcript.json")
 
-def transcribe():
-    model = whisper.load_model("base")
+MODEL_NAME = "base"
+
+# Worker processes for chunked transcription (1 = whole file, serially)
+WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "1"))
+
+# Skip silence with an energy VAD before running ASR
+VAD = os.getenv("TRANSCRIBE_VAD", "0") == "1"
+
+_model = None
+
+def load_model():
+    """
+    Whisper model shared by every call in this process.
+    """
+    global _model
+    if _model is None:
+        _model = whisper.load_model(MODEL_NAME)
+    return _model
+
+def transcribe_words(audio, model=None):
+    """
+    Run Whisper on a file path or 16 kHz float32 array and flatten
+    the result into [{word, start, end}].
+    """
+    if model is None:
+        model = load_model()
 
     result = model.transcribe(
-        AUDIO_PATH,
+        audio,
         word_timestamps=True,
         verbose=False
     )
@@ -26,10 +66,178 @@ def transcribe():
                 "end": round(word["end"], 3)
             })
 
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(transcript, f, indent=2)
+    return transcript
+
+# -----------------------------
+# CHUNKED / PARALLEL MODE
+# -----------------------------
+
+def _init_worker(threads):
+    # Split the cores between workers instead of oversubscribing them
+    torch.set_num_threads(threads)
+    load_model()
+
+def _transcribe_chunk(job):
+    audio, pieces = job
+    return unpack_words(transcribe_words(audio), pieces)
+
+def chunk_job(audio, offset):
+    """
+    Job for one contiguous chunk starting `offset` seconds in.
+    """
+    return audio, [(0.0, offset, offset + len(audio) / SAMPLE_RATE)]
+
+def chunk_executor(workers):
+    """
+    One thread on the in-process model, or a pool of model-owning processes.
+    """
+    if workers <= 1:
+        return ThreadPoolExecutor(max_workers=1)
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(max(1, (os.cpu_count() or 1) // workers),)
+    )
+
+def transcribe_regions(audio, regions, workers=WORKERS):
+    """
+    Transcribe only the given (start, end) second ranges of a 16 kHz
+    float32 signal. Short regions are packed together so each Whisper
+    call gets up to a full 30 s window; regions longer than that are
+    chunked with overlap and stitched. All calls share one executor and
+    word timestamps land on the original timeline.
+    """
+    groups, jobs = [], []
+    for pack in pack_regions(regions):
+        start_s, end_s = pack[0]
+        if len(pack) == 1 and end_s - start_s > CHUNK_SECONDS:
+            offset = int(start_s * SAMPLE_RATE)
+            region = audio[offset:int(end_s * SAMPLE_RATE)]
+            bounds = [(offset + s, offset + e) for s, e in plan_chunks(region)]
+            groups.append((len(jobs), bounds))
+            jobs.extend(chunk_job(audio[s:e], s / SAMPLE_RATE) for s, e in bounds)
+        else:
+            groups.append((len(jobs), None))
+            jobs.append(pack_audio(audio, pack))
+
+    if not jobs:
+        return []
+
+    workers = max(1, min(workers, len(jobs)))
+
+    with chunk_executor(workers) as pool:
+        chunk_words = list(pool.map(_transcribe_chunk, jobs))
+
+    print(f"✅ {len(jobs)} chunks ({len(regions)} regions) transcribed on {workers} workers")
+
+    transcript = []
+    for first, bounds in groups:
+        if bounds is None:
+            transcript.extend(chunk_words[first])
+        else:
+            transcript.extend(stitch_words(chunk_words[first:first + len(bounds)], bounds))
+    return transcript
+
+def transcribe_parallel(audio, workers=WORKERS):
+    """
+    Transcribe a 16 kHz float32 signal in overlapping chunks spread over
+    a process pool, then stitch the words back onto one timeline.
+    """
+    return transcribe_regions(audio, [(0, len(audio) / SAMPLE_RATE)], workers)
+
+def transcribe_speech(audio, workers=WORKERS):
+    """
+    VAD pre-pass: find speech regions and run ASR on those only.
+    """
+    from audio_processing.vad import detect_speech_regions, vad_report
+
+    regions = detect_speech_regions(audio)
+    report = vad_report(audio, regions)
+    print(f"🔇 VAD skipped {report['skipped_seconds']}s of {report['total_seconds']}s "
+          f"({report['skipped_ratio']:.0%}) across {report['regions']} speech regions")
+
+    return transcribe_regions(audio, regions, workers)
+
+def transcribe_stream(blocks, workers=WORKERS):
+    """
+    Transcribe audio while it is still being decoded. Blocks from
+    stream_audio() are appended to a growing float32 buffer and every
+    chunk is submitted as soon as enough audio has arrived to place its
+    cut, so ASR overlaps with ffmpeg decoding.
+    """
+    chunk = int(CHUNK_SECONDS * SAMPLE_RATE)
+    overlap = int(OVERLAP_SECONDS * SAMPLE_RATE)
+
+    buf = np.empty(chunk * 2, dtype=np.float32)
+    size = 0
+    start = 0
+    bounds, futures = [], []
+
+    with chunk_executor(workers) as pool:
+        for block in blocks:
+            if size + len(block) > len(buf):
+                grown = np.empty(max(len(buf) * 2, size + len(block)), dtype=np.float32)
+                grown[:size] = buf[:size]
+                buf = grown
+            buf[size:size + len(block)] = block
+            size += len(block)
+
+            while size > start + chunk:
+                end = next_cut(buf[:size], start)
+                bounds.append((start, end))
+                futures.append(pool.submit(_transcribe_chunk, chunk_job(buf[start:end].copy(), start / SAMPLE_RATE)))
+                start = end - overlap
+
+        if size > start or not bounds:
+            bounds.append((start, size))
+            futures.append(pool.submit(_transcribe_chunk, chunk_job(buf[start:size].copy(), start / SAMPLE_RATE)))
+
+        chunk_words = [f.result() for f in futures]
+
+    print(f"✅ {len(bounds)} streamed chunks transcribed")
+    return stitch_words(chunk_words, bounds)
+
+def transcribe_video(video_path, output_json=OUTPUT_JSON, workers=WORKERS):
+    """
+    Streaming path: decode the video's audio and transcribe it in one
+    pass, without writing or re-reading audio.wav.
+    """
+    from audio_processing.extract_audio import stream_audio
+
+    transcript = transcribe_stream(stream_audio(video_path), workers)
+
+    if output_json:
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(transcript, f, indent=2)
+
+    print("✅ Transcription complete (streamed)")
+    return transcript
+
+def transcribe(audio_path=AUDIO_PATH, output_json=OUTPUT_JSON, workers=WORKERS, vad=VAD):
+    if vad:
+        transcript = transcribe_speech(whisper.load_audio(audio_path), workers)
+    elif workers > 1:
+        transcript = transcribe_parallel(whisper.load_audio(audio_path), workers)
+    else:
+        transcript = transcribe_words(audio_path)
+
+    if output_json:
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(transcript, f, indent=2)
 
     print("✅ Transcription complete")
+    return transcript
 
 if __name__ == "__main__":
-    transcribe()
+    parser = argparse.ArgumentParser(description="Transcribe extracted audio with Whisper")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="parallel chunk workers")
+    parser.add_argument("--stream-from", metavar="VIDEO", help="decode this video directly instead of reading audio.wav")
+    parser.add_argument("--vad", action="store_true", default=VAD, help="only transcribe detected speech")
+    args = parser.parse_args()
+
+    if args.stream_from:
+        transcribe_video(args.stream_from, workers=args.workers)
+    else:
+        transcribe(workers=args.workers, vad=args.vad)
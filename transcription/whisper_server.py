@@ -0,0 +1,227 @@
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+HOST = "127.0.0.1"
+PORT = int(os.getenv("WHISPER_SERVER_PORT", "50730"))
+
+# Connections are pickled, so only holders of this key may talk to the
+# server: a random per-install secret, readable by the owner only
+AUTHKEY_PATH = os.path.join(PROJECT_ROOT, ".cache", "whisper_server.key")
+
+LOG_PATH = os.path.join(BASE_DIR, "whisper_server.log")
+
+# Max queued jobs handled per batch with the warm model
+BATCH_SIZE = 8
+
+# Seconds a client waits for an answer before transcribing in-process
+PING_TIMEOUT = 5
+TRANSCRIBE_TIMEOUT = int(os.getenv("WHISPER_SERVER_TIMEOUT", "900"))
+
+# -----------------------------
+# AUTH
+# -----------------------------
+
+def load_authkey(path=AUTHKEY_PATH):
+    """
+    WHISPER_SERVER_AUTHKEY if set, else the install's key file, created
+    with 0600 permissions on first use.
+    """
+    if os.getenv("WHISPER_SERVER_AUTHKEY"):
+        return os.environ["WHISPER_SERVER_AUTHKEY"].encode("utf-8")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        os.chmod(path, 0o600)
+        with open(path, "rb") as f:
+            return f.read()
+
+    key = secrets.token_hex(32).encode("ascii")
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+# -----------------------------
+# SERVER
+# -----------------------------
+
+def fail_jobs(jobs, error):
+    """
+    Answer every job, now and later, with `error`, so no client waits
+    on a worker that can't run.
+    """
+    while True:
+        _, _, reply = jobs.get()
+        reply.put({"ok": False, "error": error})
+
+def serve_batches(jobs, status):
+    """
+    Worker loop: block for one job, drain whatever else is queued
+    (up to BATCH_SIZE) and run the batch on the already-loaded model.
+    Identical requests (same audio file and options) in the same batch
+    are transcribed once. If the model can't be loaded, every job is
+    answered with the error and pings report the server as unavailable.
+    """
+    try:
+        from transcription.transcribe import load_model, transcribe
+        load_model()
+    except Exception as e:
+        status["error"] = f"Whisper model failed to load: {e}"
+        print(f"❌ {status['error']}")
+        fail_jobs(jobs, status["error"])
+
+    print("✅ Whisper model loaded, waiting for jobs")
+
+    while True:
+        batch = [jobs.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(jobs.get_nowait())
+            except queue.Empty:
+                break
+
+        results = {}
+        for audio_path, options, reply in batch:
+            st = os.stat(audio_path) if os.path.exists(audio_path) else None
+            key = (audio_path, st.st_size, st.st_mtime_ns, options["workers"], options["vad"]) if st else None
+
+            if key not in results:
+                started = time.time()
+                try:
+                    transcript = transcribe(audio_path, output_json=None, **options)
+                    results[key] = {"ok": True, "transcript": transcript}
+                except Exception as e:
+                    results[key] = {"ok": False, "error": str(e)}
+                print(f"🎙️ {os.path.basename(audio_path)} transcribed in {time.time() - started:.1f}s")
+
+            reply.put(results[key])
+
+        print(f"✅ Batch of {len(batch)} job(s) done")
+
+def handle_client(conn, jobs, status):
+    with conn:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+
+        if request.get("op") == "ping":
+            conn.send({"ok": status["error"] is None})
+            return
+
+        options = {
+            "workers": int(request.get("workers", 1)),
+            "vad": bool(request.get("vad", False)),
+        }
+        reply = queue.Queue(maxsize=1)
+        jobs.put((os.path.abspath(request["audio_path"]), options, reply))
+        conn.send(reply.get())
+
+def serve():
+    jobs = queue.Queue()
+    status = {"error": None}
+    threading.Thread(target=serve_batches, args=(jobs, status), daemon=True).start()
+
+    with Listener((HOST, PORT), authkey=load_authkey()) as listener:
+        print(f"🚀 Whisper server listening on {HOST}:{PORT}")
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=handle_client, args=(conn, jobs, status), daemon=True).start()
+
+# -----------------------------
+# CLIENT
+# -----------------------------
+
+def _connect():
+    try:
+        return Client((HOST, PORT), authkey=load_authkey())
+    except (OSError, AuthenticationError):
+        return None
+
+def transcribe_options():
+    """
+    The caller's TRANSCRIBE_WORKERS / TRANSCRIBE_VAD settings (as read by
+    transcribe.py), sent with every request so the server honours them.
+    """
+    return {
+        "workers": int(os.getenv("TRANSCRIBE_WORKERS", "1")),
+        "vad": os.getenv("TRANSCRIBE_VAD", "0") == "1",
+    }
+
+def _ask(conn, request, timeout):
+    """
+    Send a request and wait at most `timeout` seconds for the answer.
+    None when the server does not answer in time or hangs up.
+    """
+    try:
+        conn.send(request)
+        if not conn.poll(timeout):
+            return None
+        return conn.recv()
+    except (OSError, EOFError):
+        return None
+
+def server_available():
+    conn = _connect()
+    if conn is None:
+        return False
+    with conn:
+        response = _ask(conn, {"op": "ping"}, PING_TIMEOUT)
+    return bool(response and response.get("ok"))
+
+def request_transcript(audio_path, options=None):
+    """
+    Transcribe through the running server, with the caller's chunking
+    and VAD options. Returns None so callers fall back to in-process
+    transcription when no server is listening, it rejects our key, it
+    does not answer within TRANSCRIBE_TIMEOUT or it reports a failure.
+    """
+    conn = _connect()
+    if conn is None:
+        return None
+
+    request = dict(options or transcribe_options(), op="transcribe", audio_path=os.path.abspath(audio_path))
+    with conn:
+        response = _ask(conn, request, TRANSCRIBE_TIMEOUT)
+
+    if response is None:
+        print("❌ Whisper server did not answer, transcribing in-process")
+        return None
+    if not response["ok"]:
+        print(f"❌ Whisper server failed: {response['error']}, transcribing in-process")
+        return None
+    return response["transcript"]
+
+def ensure_server():
+    """
+    Start a background server if none is listening.
+    Returns immediately; the model finishes loading in the background.
+    """
+    if server_available():
+        return True
+
+    log = open(LOG_PATH, "a", encoding="utf-8")
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__)],
+        cwd=PROJECT_ROOT,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        start_new_session=True
+    )
+    return False
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from visual_decision_engine.intervals import join_contained
+
+# -----------------------------
+# REFERENCE
+# -----------------------------
+# The scan build_decisions used before the interval join: every segment
+# rescans every caption.
+
+def reference_join(segments, captions):
+    return [
+        [c for c, cap in enumerate(captions) if cap["start"] >= seg["start"] and cap["end"] <= seg["end"]]
+        for seg in segments
+    ]
+
+# -----------------------------
+# BENCHMARK
+# -----------------------------
+# Segment/caption containment join on a synthetic long video. The old
+# scan is quadratic, so it is timed on the first --reference segments
+# and extrapolated; results are compared on that prefix.
+# Usage: python visual_decision_engine/bench_intervals.py [--segments 12000]
+
+def synthetic_timeline(n, seed=0):
+    """
+    n back-to-back segments of 1-7 s, each split into 1-4 captions, with
+    a few captions shuffled out of order as translated exports have.
+    """
+    rng = random.Random(seed)
+    segments, captions = [], []
+    t = 0.0
+    for _ in range(n):
+        length = round(rng.uniform(1, 7), 3)
+        segments.append({"start": round(t, 3), "end": round(t + length, 3)})
+
+        cuts = sorted(rng.uniform(t, t + length) for _ in range(rng.randint(0, 3)))
+        bounds = [t] + cuts + [t + length]
+        captions.extend({"start": round(a, 3), "end": round(b, 3)} for a, b in zip(bounds, bounds[1:]))
+        t += length + rng.choice([0.0, 0.0, 0.3])
+
+    for _ in range(len(captions) // 100):
+        i, j = rng.randrange(len(captions)), rng.randrange(len(captions))
+        captions[i], captions[j] = captions[j], captions[i]
+    return segments, captions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the segment/caption interval join")
+    parser.add_argument("--segments", type=int, default=12000)
+    parser.add_argument("--reference", type=int, default=1000, help="segments to run the old scan on")
+    args = parser.parse_args()
+
+    segments, captions = synthetic_timeline(args.segments)
+
+    started = time.perf_counter()
+    joined = join_contained(segments, captions)
+    join_seconds = time.perf_counter() - started
+
+    prefix = segments[:args.reference]
+    started = time.perf_counter()
+    expected = reference_join(prefix, captions)
+    scan_seconds = (time.perf_counter() - started) * len(segments) / max(1, len(prefix))
+
+    same = joined[:len(prefix)] == expected
+    print(f"ℹ️ {len(segments)} segments, {len(captions)} captions")
+    print(f"⏱️ interval join: {join_seconds:.3f}s")
+    print(f"⏱️ old scan:      {scan_seconds:.1f}s (extrapolated from {len(prefix)} segments)")
+    print(f"🚀 speedup:       {scan_seconds / join_seconds:.0f}x")
+    print(f"{'✅' if same else '❌'} matches the old scan on the first {len(prefix)} segments")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from visual_decision_engine.decision_engine import topic_centroid_matrix
+from visual_decision_engine.topic_embeddings import MIN_MARGIN, MIN_SIMILARITY, classify_texts, embed_texts
+
+# -----------------------------
+# LABELLED EXAMPLES
+# -----------------------------
+# Segment-like sentences for each topic plus chit-chat that must stay
+# "generic". The first half of every list was used to write
+# TOPIC_DESCRIPTIONS; the second half is held out (--held-out).
+
+LABELLED_EXAMPLES = {
+    "ai": [
+        "neural nets are getting better at writing code",
+        "we trained the model on a lot of data",
+        "the chatbot answers questions for you",
+        "computers can now recognize faces in photos",
+        "these algorithms predict what you want to watch",
+        "robots are automating the boring parts",
+        "the network generates images from a prompt",
+        "it was trained on millions of examples",
+        "the model writes summaries of long documents",
+        "self driving cars use cameras and sensors",
+        "gpt can translate between languages",
+        "we built a recommendation engine",
+        "the assistant transcribes your meetings automatically",
+        "deep learning changed speech recognition",
+    ],
+    "education": [
+        "the kids did their homework",
+        "the teacher explained the lesson to the class",
+        "i studied all night for the exam",
+        "students practice these problems every week",
+        "in this tutorial you will learn the basics",
+        "she teaches math at the local school",
+        "the lecture covered the whole chapter",
+        "our university offers an online degree",
+        "my son is learning to read",
+        "the professor grades the essays",
+        "we review for the final test",
+        "online courses made learning cheaper",
+        "the class meets twice a week",
+        "homework is due on friday",
+    ],
+    "business": [
+        "our sales grew a lot this quarter",
+        "we raised money from investors",
+        "our startup found its first paying customers",
+        "the company doubled its profit",
+        "we cut prices to win more buyers",
+        "the brand launched a new marketing campaign",
+        "founders pitch their idea to venture capital",
+        "revenue was up ten percent year over year",
+        "we hired ten new salespeople",
+        "the market for this product is huge",
+        "investors want to see traction",
+        "our customers renewed their contracts",
+        "we are launching in three new cities",
+        "margins improved after the price change",
+    ],
+    "generic": [
+        "hi everyone my name is sam",
+        "the weather is nice today",
+        "thanks for watching see you next time",
+        "so let's get started",
+        "i had coffee this morning",
+        "don't forget to like and subscribe",
+        "okay that's it for today",
+        "we went to the beach last weekend",
+        "my dog loves going for walks",
+        "it's been raining all week",
+        "welcome back to the channel",
+        "i'm going to make dinner now",
+        "let me know in the comments",
+        "that was a fun trip",
+    ],
+}
+
+def split_examples(half):
+    """
+    (texts, labels) of the first (half=0) or second (half=1) half of every
+    topic's examples, or all of them (half=None).
+    """
+    texts, labels = [], []
+    for label, examples in LABELLED_EXAMPLES.items():
+        cut = len(examples) // 2
+        chosen = examples if half is None else (examples[:cut] if half == 0 else examples[cut:])
+        texts.extend(chosen)
+        labels.extend([label] * len(chosen))
+    return texts, labels
+
+# -----------------------------
+# CALIBRATION
+# -----------------------------
+
+def accuracy(texts, labels, min_similarity, min_margin):
+    predicted = classify_texts(
+        texts, topic_centroid_matrix(),
+        min_similarity=min_similarity, min_margin=min_margin
+    )
+    return sum(p == l for p, l in zip(predicted, labels)), predicted
+
+def grid_search(texts, labels):
+    """
+    Thresholds with the most correct labels; ties go to the lowest values.
+    """
+    best = None
+    for min_similarity in np.arange(0.0, 0.4, 0.01):
+        for min_margin in np.arange(0.0, 0.1, 0.01):
+            correct, _ = accuracy(texts, labels, min_similarity, min_margin)
+            if best is None or correct > best[0]:
+                best = (correct, round(float(min_similarity), 2), round(float(min_margin), 2))
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the embedding topic thresholds")
+    parser.add_argument("--held-out", action="store_true",
+                        help="fit on the first half of the examples, score on the second")
+    args = parser.parse_args()
+
+    embed_texts([t for examples in LABELLED_EXAMPLES.values() for t in examples])
+
+    if args.held_out:
+        correct, min_similarity, min_margin = grid_search(*split_examples(0))
+        texts, labels = split_examples(1)
+        held, _ = accuracy(texts, labels, min_similarity, min_margin)
+        print(f"ℹ️ fit: {correct}/{len(split_examples(0)[0])} at "
+              f"MIN_SIMILARITY={min_similarity}, MIN_MARGIN={min_margin}")
+        print(f"✅ held out: {held}/{len(texts)}")
+        return
+
+    texts, labels = split_examples(None)
+    correct, predicted = accuracy(texts, labels, MIN_SIMILARITY, MIN_MARGIN)
+    print(f"ℹ️ current thresholds: {correct}/{len(texts)} "
+          f"(MIN_SIMILARITY={MIN_SIMILARITY}, MIN_MARGIN={MIN_MARGIN})")
+    for text, label, guess in zip(texts, labels, predicted):
+        if guess != label:
+            print(f"   ❌ {text!r}: {guess} (expected {label})")
+
+    correct, min_similarity, min_margin = grid_search(texts, labels)
+    print(f"✅ best: {correct}/{len(texts)} at MIN_SIMILARITY={min_similarity}, MIN_MARGIN={min_margin}")
+
+if __name__ == "__main__":
+    main()
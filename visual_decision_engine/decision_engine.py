@@ -1,17 +1,25 @@
 import json
 import os
-from collections import Counter
+import sys
+from functools import lru_cache
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from visual_decision_engine.intervals import join_contained
+from visual_decision_engine.topic_embeddings import classify_texts, topic_centroids
+from visual_decision_engine.topic_index import build_topic_index, classify_topic
 
 SEGMENTS_PATH = os.path.join(BASE_DIR, "segmentation", "segments.json")
 CAPTIONS_PATH = os.path.join(BASE_DIR, "caption_engine", "captions.json")
-OUTPUT_PATH = os.path.join(BASE_DIR, "visual_decisions.json")
+OUTPUT_PATH = os.path.join(BASE_DIR, "visual_decision_engine", "visual_decisions.json")
 
 # -----------------------------
 # TOPIC KEYWORDS (EXTENSIBLE)
 # -----------------------------
 
+# A topic maps to a keyword list (weight 1 each) or a {keyword: weight} dict
 TOPIC_KEYWORDS = {
     "ai": [
         "ai", "artificial", "intelligence", "model",
@@ -27,6 +35,8 @@ TOPIC_KEYWORDS = {
     ]
 }
 
+TOPIC_INDEX = build_topic_index(TOPIC_KEYWORDS)
+
 # -----------------------------
 # HELPERS
 # -----------------------------
@@ -36,42 +46,42 @@ def load_json(path):
         return json.load(f)
 
 def infer_topic(words):
-    counter = Counter()
+    return classify_topic(words, TOPIC_INDEX)
 
-    for word in words:
-        w = word.lower()
-        for topic, keywords in TOPIC_KEYWORDS.items():
-            if w in keywords:
-                counter[topic] += 1
+@lru_cache(maxsize=1)
+def topic_centroid_matrix():
+    return topic_centroids(TOPIC_KEYWORDS)
 
-    if not counter:
-        return "generic"
-
-    return counter.most_common(1)[0][0]
+def segment_words(seg, captions, matched):
+    """
+    Words of the captions lying inside a segment, or the segment's own
+    words if none match. Both the keyword and the embedding classifier
+    read these.
+    """
+    words = [w.get("word", "") for c in matched for w in captions[c].get("words", [])]
+    return words or [w.get("word", "") for w in seg.get("words", [])]
 
 # -----------------------------
 # MAIN LOGIC
 # -----------------------------
 
-def main():
-    segments = load_json(SEGMENTS_PATH)
-    captions = load_json(CAPTIONS_PATH)
-
+def build_decisions(segments, captions):
     visual_decisions = []
 
+    # captions lying inside each segment, from one sorted interval join
+    matches = join_contained(segments, captions)
+    unmatched = []
+
     # IMPORTANT: segment_index is derived by enumerate
     for seg_index, seg in enumerate(segments):
         seg_start = seg["start"]
         seg_end = seg["end"]
 
-        seg_words = []
-
-        for cap in captions:
-            if cap["start"] >= seg_start and cap["end"] <= seg_end:
-                for w in cap.get("words", []):
-                    seg_words.append(w.get("word") or w.get("text", ""))
+        seg_words = segment_words(seg, captions, matches[seg_index])
 
         topic = infer_topic(seg_words)
+        if topic == "generic":
+            unmatched.append((seg_index, " ".join(seg_words)))
 
         visual_decisions.append({
             "segment_index": seg_index,
@@ -83,6 +93,19 @@ def main():
             "topic": topic
         })
 
+    # no keyword hit: nearest topic centroid, all segments in one matmul
+    texts = [text for _, text in unmatched]
+    for (i, _), topic in zip(unmatched, classify_texts(texts, topic_centroid_matrix())):
+        visual_decisions[i]["topic"] = topic
+
+    return visual_decisions
+
+def main():
+    segments = load_json(SEGMENTS_PATH)
+    captions = load_json(CAPTIONS_PATH)
+
+    visual_decisions = build_decisions(segments, captions)
+
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
         json.dump(visual_decisions, f, indent=2)
 
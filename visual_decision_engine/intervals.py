@@ -0,0 +1,64 @@
+import numpy as np
+
+# -----------------------------
+# INTERVAL INDEX
+# -----------------------------
+
+def interval_index(items, start="start", end="end"):
+    """
+    Sort a list of timed dicts once for repeated range queries. Keeps the
+    original positions so results come back in input order.
+    """
+    starts = np.array([it[start] for it in items], dtype=np.float64)
+    ends = np.array([it[end] for it in items], dtype=np.float64)
+    order = np.argsort(starts, kind="stable")
+    return {
+        "order": order,
+        "starts": starts[order],
+        "ends": ends[order],
+        "max_length": float((ends - starts).max()) if len(items) else 0.0,
+    }
+
+def _pick(index, lo, hi, keep):
+    rows = index["order"][lo:hi][keep]
+    return np.sort(rows).tolist()
+
+def contained(index, start, end):
+    """
+    Positions of intervals lying inside [start, end].
+    """
+    lo = np.searchsorted(index["starts"], start, side="left")
+    hi = np.searchsorted(index["starts"], end, side="right")
+    return _pick(index, lo, hi, index["ends"][lo:hi] <= end)
+
+def overlapping(index, start, end):
+    """
+    Positions of intervals with start <= end and end > start. Only those
+    starting within max_length before `start` can reach it.
+    """
+    lo = np.searchsorted(index["starts"], start - index["max_length"], side="left")
+    hi = np.searchsorted(index["starts"], end, side="right")
+    return _pick(index, lo, hi, index["ends"][lo:hi] > start)
+
+# -----------------------------
+# JOINS
+# -----------------------------
+
+def join_contained(outer, inner, start="start", end="end"):
+    """
+    For every outer interval, the positions of inner intervals inside it
+    (inner[start] >= outer start and inner[end] <= outer end), in inner
+    order. Both sides are located with one searchsorted each, so the
+    cost is O((n + m) log m) plus the matches.
+    """
+    index = interval_index(inner, start, end)
+    outer_starts = np.array([o[start] for o in outer], dtype=np.float64)
+    outer_ends = np.array([o[end] for o in outer], dtype=np.float64)
+
+    los = np.searchsorted(index["starts"], outer_starts, side="left")
+    his = np.searchsorted(index["starts"], outer_ends, side="right")
+
+    return [
+        _pick(index, lo, hi, index["ends"][lo:hi] <= e)
+        for lo, hi, e in zip(los.tolist(), his.tolist(), outer_ends.tolist())
+    ]
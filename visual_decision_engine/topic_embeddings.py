@@ -0,0 +1,210 @@
+import hashlib
+import math
+import os
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from visual_decision_engine.topic_index import normalize
+
+# -----------------------------
+# PATHS
+# -----------------------------
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMBEDDING_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "embeddings")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+EMBEDDING_DIM = 2048           # hashed feature buckets
+NGRAM_RANGE = (3, 5)           # character n-grams inside " word " boundaries
+EMBEDDING_VERSION = 2          # bump when the vectorizer changes (invalidates the cache)
+EMBEDDING_CACHE_MAX_BYTES = 64 * 1024 ** 2  # least recently used vectors go first
+
+# Calibrated with calibrate_topics.py on its 56 labelled sentences (three
+# topics plus chit-chat): 45/56 right with these values, against 29/56
+# before stopwords and the wider descriptions. Fitted on half of them, the
+# other half scores 17/28 (--held-out): expect about that on phrasings
+# unlike anything in TOPIC_DESCRIPTIONS. Accuracy is flat for similarity
+# thresholds 0.02-0.08; the margin test does most of the work.
+MIN_SIMILARITY = 0.04          # below this a segment stays "generic"
+MIN_MARGIN = 0.03              # ...as it does when the runner-up is this close
+
+# Function words carry no topic and their n-grams only add noise
+STOPWORDS = frozenset("""
+    a an the and or but so of to in on at for from with by as is are was
+    were be been am i you he she it we they me my our your their this that
+    these those there here its it's let's what who how do did does done
+    have has had not no just very really lot up out about over all some
+    any can will would could should get got go went okay ok yeah um uh
+    like well then than now today one
+""".split())
+
+# Phrases that describe a topic beyond its exact keywords. Matching is
+# lexical (shared words and word pieces), so a paraphrase only lands near
+# a centroid when it shares stems with these ("salespeople" / "sales");
+# synonyms with nothing in common are not recognised.
+TOPIC_DESCRIPTIONS = {
+    "ai": [
+        "artificial intelligence", "machine learning", "neural network",
+        "neural nets", "deep learning", "language model", "chatbot", "gpt",
+        "algorithm", "automation", "automated", "robots", "training data",
+        "trained on data", "computer vision", "recognize images",
+        "predictions", "generates text",
+    ],
+    "education": [
+        "students learn", "teaching", "teacher", "lesson", "school", "kids",
+        "children", "university", "degree", "classroom", "tutorial",
+        "homework", "lecture", "study", "studied", "exam", "test", "chapter",
+        "practice problems",
+    ],
+    "business": [
+        "startup company", "sales", "sold", "profit", "revenue", "customers",
+        "buyers", "investors", "raised money", "funding", "venture capital",
+        "marketing", "campaign", "scaling", "grew", "growth", "quarter",
+        "prices", "pricing", "brand", "entrepreneur", "founders", "percent",
+    ],
+}
+
+# -----------------------------
+# VECTORIZER
+# -----------------------------
+
+def _features(text):
+    """
+    Word and character n-gram counts of a text, after the same
+    normalization the keyword index uses, without stopwords.
+    """
+    words = [w for w in (normalize(t) for t in text.split()) if w and w not in STOPWORDS]
+    feats = Counter(words)
+    lo, hi = NGRAM_RANGE
+    for w in words:
+        padded = f" {w} "
+        for n in range(lo, hi + 1):
+            for i in range(len(padded) - n + 1):
+                feats["#" + padded[i:i + n]] += 1
+    return feats
+
+def embed_text(text):
+    """
+    Signed feature-hashing vector with sublinear term frequency, L2
+    normalized. No vocabulary and no model files: stable across runs.
+    """
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for feat, count in _features(text).items():
+        h = zlib.crc32(feat.encode("utf-8"))
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vec[h % EMBEDDING_DIM] += sign * (1.0 + math.log(count))
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+# -----------------------------
+# CACHE
+# -----------------------------
+
+_memory = {}
+
+def text_key(text):
+    blob = f"{EMBEDDING_VERSION}:{EMBEDDING_DIM}:{NGRAM_RANGE}:{text}".encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+def cached_embedding(text):
+    """
+    embed_text through an in-process dict and .cache/embeddings, keyed by
+    the text's hash, so unchanged segments are never re-embedded.
+    """
+    key = text_key(text)
+    if key in _memory:
+        return _memory[key]
+
+    path = os.path.join(EMBEDDING_CACHE_DIR, f"{key}.npy")
+    try:
+        vec = np.load(path).astype(np.float32)
+        os.utime(path)   # refresh its LRU position
+    except (OSError, ValueError):
+        vec = embed_text(text)
+        os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+        with open(path + ".part", "wb") as f:
+            np.save(f, vec.astype(np.float16))   # half the disk, ample for cosines
+        os.replace(path + ".part", path)
+        vec = vec.astype(np.float16).astype(np.float32)
+
+    _memory[key] = vec
+    return vec
+
+def embed_texts(texts):
+    """
+    (len(texts), EMBEDDING_DIM) matrix of cached embeddings.
+    """
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+
+    cached = len(_memory)
+    matrix = np.stack([cached_embedding(t) for t in texts])
+    if len(_memory) > cached:
+        prune_embedding_cache()
+    return matrix
+
+def prune_embedding_cache(max_bytes=EMBEDDING_CACHE_MAX_BYTES):
+    """
+    Evict the least recently used vectors until the cache fits in max_bytes.
+    """
+    if not os.path.isdir(EMBEDDING_CACHE_DIR):
+        return
+
+    entries = []
+    for name in os.listdir(EMBEDDING_CACHE_DIR):
+        path = os.path.join(EMBEDDING_CACHE_DIR, name)
+        st = os.stat(path)
+        entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+# -----------------------------
+# CLASSIFIER
+# -----------------------------
+
+def topic_centroids(topic_keywords, descriptions=TOPIC_DESCRIPTIONS):
+    """
+    (topics, matrix): one L2-normalized row per topic, the mean of its
+    keyword and description-phrase embeddings.
+    """
+    topics = list(topic_keywords)
+    rows = []
+    for topic in topics:
+        phrases = list(topic_keywords[topic]) + descriptions.get(topic, [])
+        centroid = embed_texts(phrases).mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        rows.append(centroid / norm if norm else centroid)
+    return topics, np.stack(rows)
+
+def classify_texts(texts, centroids, default="generic",
+                   min_similarity=MIN_SIMILARITY, min_margin=MIN_MARGIN):
+    """
+    Nearest topic for every text from one (texts x topics) matmul of
+    cosine similarities. Texts that are not clearly closer to one topic
+    get `default`.
+    """
+    topics, matrix = centroids
+    if not texts:
+        return []
+
+    sims = embed_texts(texts) @ matrix.T
+    ranked = np.sort(sims, axis=1)
+    best = sims.argmax(axis=1)
+    best_sim = ranked[:, -1]
+    margin = best_sim - ranked[:, -2] if len(topics) > 1 else best_sim
+
+    confident = (best_sim >= min_similarity) & (margin >= min_margin)
+    return [
+        topics[b] if ok else default
+        for b, ok in zip(best.tolist(), confident.tolist())
+    ]
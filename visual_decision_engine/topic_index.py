@@ -0,0 +1,59 @@
+from functools import lru_cache
+
+# -----------------------------
+# NORMALIZATION
+# -----------------------------
+
+PUNCTUATION = " .,?!;:\"'()[]"
+
+@lru_cache(maxsize=65536)
+def normalize(word):
+    """
+    Lowercase, strip punctuation and a plural "s" — the same for keywords
+    and transcript words, so lookups are a single dict hit.
+    """
+    w = word.strip(PUNCTUATION).lower()
+    if len(w) > 3 and w.endswith("s") and not w.endswith("ss"):
+        w = w[:-1]
+    return w
+
+# -----------------------------
+# INDEX
+# -----------------------------
+
+def build_topic_index(topic_keywords):
+    """
+    Compile {topic: keywords} into {token: ((topic_id, weight), ...)}.
+    Keywords are a list (weight 1) or a {keyword: weight} dict.
+    """
+    topics = list(topic_keywords)
+    tokens = {}
+
+    for topic_id, topic in enumerate(topics):
+        keywords = topic_keywords[topic]
+        if not isinstance(keywords, dict):
+            keywords = dict.fromkeys(keywords, 1.0)
+
+        for keyword, weight in keywords.items():
+            hits = tokens.setdefault(normalize(keyword), {})
+            hits.setdefault(topic_id, weight)
+
+    return {
+        "topics": topics,
+        "tokens": {token: tuple(hits.items()) for token, hits in tokens.items()},
+    }
+
+def classify_topic(words, index, default="generic"):
+    """
+    Highest-weighted topic over the words, in one pass; ties go to the
+    topic seen first. Cost per word is one lookup plus its own topics.
+    """
+    tokens = index["tokens"]
+    scores = {}
+    for word in words:
+        for topic_id, weight in tokens.get(normalize(word), ()):
+            scores[topic_id] = scores.get(topic_id, 0) + weight
+
+    if not scores:
+        return default
+    return index["topics"][max(scores, key=scores.get)]